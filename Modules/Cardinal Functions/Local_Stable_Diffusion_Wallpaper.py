@@ -5,6 +5,7 @@ import cv2 as cv
 import numpy as np
 import torch
 import random
+import math
 from diffusers import (AutoPipelineForImage2Image, StableDiffusionControlNetPipeline, ControlNetModel)
 
 def choose_device(torch_device=None):
@@ -67,27 +68,27 @@ def process_lcm(image, lower_threshold=100, upper_threshold=100, aperture=3):
 def process_sdxlturbo(image):
     return image
 
-def prepare_lcm_controlnet_or_sdxlturbo_pipeline():
-    if MODEL == "lcm":
-        controlnet = ControlNetModel.from_pretrained(CONTROLNET_CANNY_LOCATION, torch_dtype=TORCH_DTYPE,
+def prepare_lcm_controlnet_or_sdxlturbo_pipeline(model=MODEL, torch_device=TORCH_DEVICE, torch_dtype=TORCH_DTYPE):
+    if model == "lcm":
+        controlnet = ControlNetModel.from_pretrained(CONTROLNET_CANNY_LOCATION, torch_dtype=torch_dtype,
                                                      use_safetensors=True)
         pipeline = StableDiffusionControlNetPipeline.from_pretrained(LCM_MODEL_LOCATION,
                                                                      controlnet=controlnet,
-                                                                     torch_dtype=TORCH_DTYPE, safety_checker=None).to(TORCH_DEVICE)
-    elif MODEL == "sdxlturbo":
+                                                                     torch_dtype=torch_dtype, safety_checker=None).to(torch_device)
+    elif model == "sdxlturbo":
         pipeline = AutoPipelineForImage2Image.from_pretrained(
-            SDXLTURBO_MODEL_LOCATION, torch_dtype=TORCH_DTYPE,
-            safety_checker=None).to(TORCH_DEVICE)
+            SDXLTURBO_MODEL_LOCATION, torch_dtype=torch_dtype,
+            safety_checker=None).to(torch_device)
         
     return pipeline
 
-def run_lcm(pipeline, ref_image):
+def run_lcm(pipeline, ref_image, num_inference_steps=INFERENCE_STEPS, width=WIDTH, height=HEIGHT):
     generator = prepare_seed()
     gen_image = pipeline(prompt=DEFAULT_PROMPT,
-                         num_inference_steps=INFERENCE_STEPS,
+                         num_inference_steps=num_inference_steps,
                          guidance_scale=GUIDANCE_SCALE,
-                         width=WIDTH,
-                         height=HEIGHT,
+                         width=width,
+                         height=height,
                          generator=generator,
                          image=ref_image,
                          controlnet_conditioning_scale=CONDITIONING_SCALE,
@@ -96,28 +97,63 @@ def run_lcm(pipeline, ref_image):
 
     return gen_image
 
-def run_sdxlturbo(pipeline, ref_image):
+def run_sdxlturbo(pipeline, ref_image, num_inference_steps=INFERENCE_STEPS, width=WIDTH, height=HEIGHT):
     generator = prepare_seed()
     gen_image = pipeline(prompt=DEFAULT_PROMPT,
-                         num_inference_steps=INFERENCE_STEPS,
+                         num_inference_steps=num_inference_steps,
                          guidance_scale=0.0,
-                         width=WIDTH,
-                         height=HEIGHT,
+                         width=width,
+                         height=height,
                          generator=generator,
                          image=ref_image,
                          strength=DEFAULT_NOISE_STRENGTH).images[0]
                         
     return gen_image
 
+class PipelineSession:
+    "keeps one loaded pipeline per (model, device) alive across frames"
+
+    _sessions = {}
+
+    def __init__(self, model=MODEL, torch_device=TORCH_DEVICE, torch_dtype=TORCH_DTYPE, pipeline=None):
+        self.model = model
+        self.torch_device = torch_device
+        self.torch_dtype = torch_dtype
+        # A prebuilt pipeline (e.g. a tiny randomly-initialized one) skips loading from disk
+        if pipeline is None:
+            pipeline = prepare_lcm_controlnet_or_sdxlturbo_pipeline(model, torch_device, torch_dtype)
+        self.pipeline = pipeline
+        self.pipeline.set_progress_bar_config(disable=True)
+        self.processor = process_lcm if model == "lcm" else process_sdxlturbo
+        self.run_model = run_lcm if model == "lcm" else run_sdxlturbo
+        self.warmed_up = False
+
+    @classmethod
+    def get(cls, model=MODEL, torch_device=TORCH_DEVICE, torch_dtype=TORCH_DTYPE):
+        key = (model, torch_device)
+        if key not in cls._sessions:
+            cls._sessions[key] = cls(model, torch_device, torch_dtype)
+        return cls._sessions[key]
+
+    def warm_up(self, width=WIDTH, height=HEIGHT):
+        "one throwaway shortest pass so kernel setup and allocations happen before the first frame"
+        # img2img only runs int(steps * strength) denoising steps, so sdxlturbo needs enough steps for at least one
+        steps = 1 if self.model == "lcm" else max(1, math.ceil(1 / DEFAULT_NOISE_STRENGTH))
+        blank = np.zeros((height, width, 3), dtype=np.uint8)
+        ref_image = convert_numpy_image_to_pil_image(self.processor(blank))
+        with torch.inference_mode():
+            self.run_model(self.pipeline, ref_image, num_inference_steps=steps, width=width, height=height)
+        self.warmed_up = True
+
+    def generate(self, ref_image, width=WIDTH, height=HEIGHT):
+        with torch.inference_mode():
+            return self.run_model(self.pipeline, ref_image, width=width, height=height)
+
 def run_lcm_or_sdxl():
     ###
     ### PREPARE MODELS
     ###
-    pipeline = prepare_lcm_controlnet_or_sdxlturbo_pipeline()
-    
-    processor = process_lcm if MODEL == "lcm" else process_sdxlturbo
-
-    run_model = run_lcm if MODEL == "lcm" else run_sdxlturbo
+    session = PipelineSession.get()
 
     ###
     ### RUN DIFFUSION WITH RANDOM BACKGROUND COLOR
@@ -132,9 +168,9 @@ def run_lcm_or_sdxl():
 
     result_image, masked_image = get_result_and_mask(screen, center_x, center_y, WIDTH, HEIGHT)
 
-    numpy_image = processor(masked_image)
+    numpy_image = session.processor(masked_image)
     pil_image = convert_numpy_image_to_pil_image(numpy_image)
-    pil_image = run_model(pipeline, pil_image)
+    pil_image = session.generate(pil_image)
 
     result_image[center_y:center_y+HEIGHT, center_x:center_x+WIDTH] = cv.cvtColor(np.array(pil_image), cv.COLOR_RGB2BGR)
 
@@ -159,6 +195,9 @@ root.configure(bg='black')
 label = Label(root)
 label.pack(expand=True)
 
+# Load the pipeline once and warm it up before the first frame
+PipelineSession.get().warm_up()
+
 # Start the image generation process
 root.after(0, run_lcm_or_sdxl)
 
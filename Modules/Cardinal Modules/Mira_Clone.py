@@ -6,7 +6,7 @@ import numpy as np
 import pygame
 import tkinter as tk
 from tkinter import ttk
-from scipy.signal import butter, lfilter
+from scipy.signal import butter, sosfilt
 import math
 from screeninfo import get_monitors
 import time
@@ -28,6 +28,7 @@ VGAIN_MAX = 960.0            # Maximum VGain
 FILTER_TYPE = 'None'         # Options: 'None', 'Lowpass', 'Highpass'
 CUTOFF_FREQ = 5000           # Cutoff frequency in Hz
 FILTER_ORDER = 5             # Filter order
+SOS_CACHE_SIZE = 256         # Filter designs kept for reuse while sweeping the cutoff
 
 # Echo Configuration
 ECHO_ENABLED = False
@@ -97,7 +98,7 @@ class Echo:
         self.delay_gain = delay_gain
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size
-        self.delay_buffer_size = int(self.delay_time * self.sample_rate)
+        self.delay_buffer_size = max(1, int(self.delay_time * self.sample_rate))
         self.delay_buffer = np.zeros(self.delay_buffer_size, dtype=np.float32)
         self.delay_index = 0
 
@@ -105,7 +106,7 @@ class Echo:
         self.reverb_time = reverb_time
         self.reverb_dry_wet = reverb_dry_wet
         self.reverb_gain = reverb_gain
-        self.reverb_buffer_size = int(self.reverb_time * self.sample_rate)
+        self.reverb_buffer_size = max(1, int(self.reverb_time * self.sample_rate))
         self.reverb_buffer = np.zeros(self.reverb_buffer_size, dtype=np.float32)
         self.reverb_index = 0
 
@@ -113,7 +114,7 @@ class Echo:
                          reverb_time=None, reverb_dry_wet=None, reverb_gain=None):
         if delay_time is not None and delay_time != self.delay_time:
             self.delay_time = delay_time
-            self.delay_buffer_size = int(self.delay_time * self.sample_rate)
+            self.delay_buffer_size = max(1, int(self.delay_time * self.sample_rate))
             self.delay_buffer = np.zeros(self.delay_buffer_size, dtype=np.float32)
             self.delay_index = 0
         if delay_dry_wet is not None:
@@ -125,7 +126,7 @@ class Echo:
 
         if reverb_time is not None and reverb_time != self.reverb_time:
             self.reverb_time = reverb_time
-            self.reverb_buffer_size = int(self.reverb_time * self.sample_rate)
+            self.reverb_buffer_size = max(1, int(self.reverb_time * self.sample_rate))
             self.reverb_buffer = np.zeros(self.reverb_buffer_size, dtype=np.float32)
             self.reverb_index = 0
         if reverb_dry_wet is not None:
@@ -133,25 +134,32 @@ class Echo:
         if reverb_gain is not None:
             self.reverb_gain = reverb_gain
 
+    def _process_line(self, buffer, index, samples, gain, feedback):
+        # Walk the circular line in spans that never cross the write head, so each
+        # span only reads entries written before it and runs as whole numpy ops
+        size = len(buffer)
+        output = np.empty_like(samples)
+        start = 0
+        while start < len(samples):
+            span = min(len(samples) - start, size - index)
+            delayed = buffer[index:index + span].copy()
+            buffer[index:index + span] = samples[start:start + span] * gain + delayed * feedback
+            output[start:start + span] = delayed
+            index = (index + span) % size
+            start += span
+        return output, index
+
     def process(self, samples):
         # Process Delay
-        delayed_samples = np.zeros_like(samples)
-        for i in range(len(samples)):
-            delayed_samples[i] = self.delay_buffer[self.delay_index]
-            # Update delay buffer with current sample + feedback
-            self.delay_buffer[self.delay_index] = samples[i] * self.delay_gain + delayed_samples[i] * self.delay_feedback
-            self.delay_index = (self.delay_index + 1) % self.delay_buffer_size
+        delayed_samples, self.delay_index = self._process_line(
+            self.delay_buffer, self.delay_index, samples, self.delay_gain, self.delay_feedback)
 
         # Mix dry and wet for delay
         delay_output = (1 - self.delay_dry_wet) * samples + self.delay_dry_wet * delayed_samples
 
         # Process Reverb
-        reverbed_samples = np.zeros_like(samples)
-        for i in range(len(samples)):
-            reverbed_samples[i] = self.reverb_buffer[self.reverb_index]
-            # Update reverb buffer with current delay_output + reverberated signal
-            self.reverb_buffer[self.reverb_index] = delay_output[i] * self.reverb_gain + reverbed_samples[i] * self.delay_feedback
-            self.reverb_index = (self.reverb_index + 1) % self.reverb_buffer_size
+        reverbed_samples, self.reverb_index = self._process_line(
+            self.reverb_buffer, self.reverb_index, delay_output, self.reverb_gain, self.delay_feedback)
 
         # Mix dry and wet for reverb
         reverb_output = (1 - self.reverb_dry_wet) * delay_output + self.reverb_dry_wet * reverbed_samples
@@ -196,24 +204,57 @@ def show_simple_selection_dialog():
     root.mainloop()
     return app.is_selected()
 
-def butter_lowpass(cutoff, fs, order=5):
+def butter_lowpass(cutoff, fs, order=5, output='ba'):
     nyq = 0.5 * fs
     normal_cutoff = cutoff / nyq
     if normal_cutoff >= 1:
         normal_cutoff = 0.99
-    b, a = butter(order, normal_cutoff, btype='low', analog=False)
-    return b, a
+    return butter(order, normal_cutoff, btype='low', analog=False, output=output)
 
-def butter_highpass(cutoff, fs, order=5):
+def butter_highpass(cutoff, fs, order=5, output='ba'):
     nyq = 0.5 * fs
     normal_cutoff = cutoff / nyq
     if normal_cutoff <= 0:
         normal_cutoff = 0.01
-    b, a = butter(order, normal_cutoff, btype='high', analog=False)
-    return b, a
+    return butter(order, normal_cutoff, btype='high', analog=False, output=output)
 
-def apply_filter(data, b, a):
-    return lfilter(b, a, data)
+class StreamingFilter:
+    def __init__(self, sample_rate=SAMPLE_RATE, order=FILTER_ORDER):
+        self.sample_rate = sample_rate
+        self.order = order
+        self.sos_cache = {}
+        self.filter_type = 'None'
+        self.sos = None
+        self.zi = None
+
+    def set_filter(self, filter_type, cutoff):
+        if filter_type == 'None':
+            self.filter_type = filter_type
+            self.sos = None
+            self.zi = None
+            return
+        # Repeated log steps land a hair off the same frequency, so key on the cutoff to 0.1 Hz
+        cutoff = round(cutoff, 1)
+        key = (filter_type, cutoff, self.order)
+        if key not in self.sos_cache:
+            if len(self.sos_cache) >= SOS_CACHE_SIZE:
+                del self.sos_cache[next(iter(self.sos_cache))]  # Oldest design first
+            if filter_type == 'Lowpass':
+                self.sos_cache[key] = butter_lowpass(cutoff, self.sample_rate, self.order, output='sos')
+            else:
+                self.sos_cache[key] = butter_highpass(cutoff, self.sample_rate, self.order, output='sos')
+        self.sos = self.sos_cache[key]
+        # Keep the filter state across cutoff sweeps so the output stays continuous,
+        # only a change of filter type starts from rest
+        if filter_type != self.filter_type or self.zi is None:
+            self.zi = np.zeros((self.sos.shape[0], 2))
+        self.filter_type = filter_type
+
+    def process(self, data):
+        if self.sos is None:
+            return data
+        filtered, self.zi = sosfilt(self.sos, data, zi=self.zi)
+        return filtered
 
 def initialize_pyaudio():
     p = pyaudio.PyAudio()
@@ -295,17 +336,12 @@ def decode_preset(preset_dict):
     )
 
 def apply_preset(preset_dict, vosc, echo):
-    global vgain, CUTOFF_FREQ, FILTER_TYPE, filter_b, filter_a
+    global vgain, CUTOFF_FREQ, FILTER_TYPE, veq_filter
     (vgain, CUTOFF_FREQ, FILTER_TYPE, vosc_freq, vosc_amp, vosc_playing,
      echo_enabled, echo_delay_time, echo_delay_dry_wet, echo_delay_feedback, echo_delay_gain,
      echo_reverb_time, echo_reverb_dry_wet, echo_reverb_gain) = decode_preset(preset_dict)
     
-    if FILTER_TYPE == 'Lowpass':
-        filter_b, filter_a = butter_lowpass(CUTOFF_FREQ, SAMPLE_RATE, FILTER_ORDER)
-    elif FILTER_TYPE == 'Highpass':
-        filter_b, filter_a = butter_highpass(CUTOFF_FREQ, SAMPLE_RATE, FILTER_ORDER)
-    else:
-        filter_b, filter_a = None, None
+    veq_filter.set_filter(FILTER_TYPE, CUTOFF_FREQ)
 
     vosc.set_frequency(vosc_freq)
     vosc.set_amplitude(vosc_amp)
@@ -407,18 +443,15 @@ def adjust_logarithmic(value, direction, min_value, max_value, factor=1.1):
 
 def main_visualizer():
     global FILTER_TYPE, CUTOFF_FREQ, FILTER_TYPES, current_filter_index
-    global VGAIN_MIN, VGAIN_MAX, vgain, filter_b, filter_a, presets
+    global VGAIN_MIN, VGAIN_MAX, vgain, veq_filter, presets
     global ECHO_ENABLED, ECHO_DELAY_TIME, ECHO_DELAY_DRY_WET, ECHO_DELAY_FEEDBACK, ECHO_DELAY_GAIN
     global ECHO_REVERB_TIME, ECHO_REVERB_DRY_WET, ECHO_REVERB_GAIN
 
     p, stream = initialize_pyaudio()
     screen, clock, window_width, window_height = initialize_pygame()
     vgain = VGAIN_DEFAULT
-    filter_b, filter_a = None, None
-    if FILTER_TYPE == 'Lowpass':
-        filter_b, filter_a = butter_lowpass(CUTOFF_FREQ, SAMPLE_RATE, FILTER_ORDER)
-    elif FILTER_TYPE == 'Highpass':
-        filter_b, filter_a = butter_highpass(CUTOFF_FREQ, SAMPLE_RATE, FILTER_ORDER)
+    veq_filter = StreamingFilter(SAMPLE_RATE, FILTER_ORDER)
+    veq_filter.set_filter(FILTER_TYPE, CUTOFF_FREQ)
 
     # Initialize Echo
     echo = Echo(
@@ -457,7 +490,7 @@ def main_visualizer():
     load_presets()
 
     def render_frame():
-        global CHUNK, vgain, FILTER_TYPE, filter_b, filter_a, ECHO_ENABLED
+        global CHUNK, vgain, FILTER_TYPE, veq_filter, ECHO_ENABLED
         global CUTOFF_FREQ, ECHO_DELAY_TIME, ECHO_DELAY_DRY_WET, ECHO_DELAY_FEEDBACK, ECHO_DELAY_GAIN
         global ECHO_REVERB_TIME, ECHO_REVERB_DRY_WET, ECHO_REVERB_GAIN
 
@@ -475,8 +508,8 @@ def main_visualizer():
         samples *= vgain
 
         # Apply VEQ filter if enabled
-        if FILTER_TYPE != 'None' and filter_b is not None and filter_a is not None:
-            samples = apply_filter(samples, filter_b, filter_a)
+        if FILTER_TYPE != 'None':
+            samples = veq_filter.process(samples)
 
         # Apply master gain is already done via vgain
 
@@ -626,35 +659,19 @@ def main_visualizer():
                         if current_param == 'CUTOFF_FREQ':
                             if keys[pygame.K_UP]:
                                 CUTOFF_FREQ = adjust_logarithmic(CUTOFF_FREQ, 'up', 100.0, SAMPLE_RATE / 2 - 100.0)
-                                if FILTER_TYPE == 'Lowpass':
-                                    filter_b, filter_a = butter_lowpass(CUTOFF_FREQ, SAMPLE_RATE, FILTER_ORDER)
-                                elif FILTER_TYPE == 'Highpass':
-                                    filter_b, filter_a = butter_highpass(CUTOFF_FREQ, SAMPLE_RATE, FILTER_ORDER)
+                                veq_filter.set_filter(FILTER_TYPE, CUTOFF_FREQ)
                             elif keys[pygame.K_DOWN]:
                                 CUTOFF_FREQ = adjust_logarithmic(CUTOFF_FREQ, 'down', 100.0, SAMPLE_RATE / 2 - 100.0)
-                                if FILTER_TYPE == 'Lowpass':
-                                    filter_b, filter_a = butter_lowpass(CUTOFF_FREQ, SAMPLE_RATE, FILTER_ORDER)
-                                elif FILTER_TYPE == 'Highpass':
-                                    filter_b, filter_a = butter_highpass(CUTOFF_FREQ, SAMPLE_RATE, FILTER_ORDER)
+                                veq_filter.set_filter(FILTER_TYPE, CUTOFF_FREQ)
                         elif current_param == 'FILTER_TYPE':
                             if keys[pygame.K_UP]:
                                 current_filter_index = (current_filter_index + 1) % len(FILTER_TYPES)
                                 FILTER_TYPE = FILTER_TYPES[current_filter_index]
-                                if FILTER_TYPE == 'Lowpass':
-                                    filter_b, filter_a = butter_lowpass(CUTOFF_FREQ, SAMPLE_RATE, FILTER_ORDER)
-                                elif FILTER_TYPE == 'Highpass':
-                                    filter_b, filter_a = butter_highpass(CUTOFF_FREQ, SAMPLE_RATE, FILTER_ORDER)
-                                else:
-                                    filter_b, filter_a = None, None
+                                veq_filter.set_filter(FILTER_TYPE, CUTOFF_FREQ)
                             elif keys[pygame.K_DOWN]:
                                 current_filter_index = (current_filter_index - 1) % len(FILTER_TYPES)
                                 FILTER_TYPE = FILTER_TYPES[current_filter_index]
-                                if FILTER_TYPE == 'Lowpass':
-                                    filter_b, filter_a = butter_lowpass(CUTOFF_FREQ, SAMPLE_RATE, FILTER_ORDER)
-                                elif FILTER_TYPE == 'Highpass':
-                                    filter_b, filter_a = butter_highpass(CUTOFF_FREQ, SAMPLE_RATE, FILTER_ORDER)
-                                else:
-                                    filter_b, filter_a = None, None
+                                veq_filter.set_filter(FILTER_TYPE, CUTOFF_FREQ)
                     elif selected_effect == 'Echo':
                         if current_param == 'ECHO_ENABLED':
                             if keys[pygame.K_UP]:
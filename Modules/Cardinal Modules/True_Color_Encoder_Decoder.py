@@ -7,6 +7,7 @@ import os
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import threading
+import time
 
 def audio_to_hex(audio_path):
     """
@@ -38,6 +39,39 @@ def audio_to_hex(audio_path):
         messagebox.showerror("Error", f"Failed to process audio file.\n{e}")
         return None, None, None
 
+def audio_to_rgb(audio_path):
+    """
+    Reads an audio file and maps its samples straight to a (N, 3) uint8 RGB array,
+    using the same 24-bit layout as audio_to_hex without the string round-trip.
+    """
+    try:
+        # Read audio file
+        audio_data, sample_rate = sf.read(audio_path)
+
+        # If stereo, take the mean to convert to mono
+        if len(audio_data.shape) == 2:
+            audio_data = audio_data.mean(axis=1)
+
+        duration = len(audio_data) / sample_rate
+
+        # Normalize audio data to range [-1, 1]
+        peak = np.max(np.abs(audio_data)) if len(audio_data) else 0
+        if peak != 0:
+            audio_data = audio_data / peak
+
+        # Convert to 24-bit signed integers and split into R, G, B bytes
+        max_amplitude = 2**23 - 1
+        samples_int = (audio_data * max_amplitude).astype(np.int32) & 0xFFFFFF
+        colors = np.empty((len(samples_int), 3), dtype=np.uint8)
+        colors[:, 0] = samples_int >> 16
+        colors[:, 1] = (samples_int >> 8) & 0xFF
+        colors[:, 2] = samples_int & 0xFF
+
+        return colors, sample_rate, duration
+    except Exception as e:
+        messagebox.showerror("Error", f"Failed to process audio file.\n{e}")
+        return None, None, None
+
 def generate_color_strip(hex_codes):
     """
     Converts hex codes to RGB tuples.
@@ -81,11 +115,28 @@ def make_frame(t, colors, samples_per_frame, frame_number, resolution, strip_wid
 
     return np.array(img)
 
+def make_frame_array(colors, samples_per_frame, frame_number, resolution, strip_width, max_blocks):
+    """
+    Generates a single video frame from a uint8 RGB array by repeating each
+    sample across its strip and broadcasting the row down the frame height.
+    """
+    start_idx = frame_number * samples_per_frame
+    current_strip = colors[start_idx:start_idx + max_blocks]
+
+    frame = np.zeros((resolution[1], resolution[0], 3), dtype=np.uint8)
+    row = np.repeat(current_strip, strip_width, axis=0)
+    # Missing samples at the end of the audio stay black
+    frame[:, :len(row)] = row
+    return frame
+
 def generate_video_stream(audio_path, colors, sample_rate, duration, output_video, frame_rate=60, resolution=(3840, 2160), strip_width=8):
     """
     Generates a video from colors synchronized with the audio using a color strip.
     """
     try:
+        # Accept either RGB tuples or an RGB array from audio_to_rgb
+        colors = np.asarray(colors, dtype=np.uint8).reshape(-1, 3)
+
         # Calculate the number of color blocks that fit in the frame width
         frame_width, frame_height = resolution
         max_blocks = frame_width // strip_width
@@ -101,7 +152,7 @@ def generate_video_stream(audio_path, colors, sample_rate, duration, output_vide
         # Define a VideoClip with a frame generator
         def frame_generator(t):
             frame_number = int(t * frame_rate)
-            return make_frame(t, colors, samples_per_frame, frame_number, resolution, strip_width, max_blocks)
+            return make_frame_array(colors, samples_per_frame, frame_number, resolution, strip_width, max_blocks)
 
         # Create the video clip
         clip = VideoClip(make_frame=frame_generator, duration=duration)
@@ -131,10 +182,8 @@ def generate_video_stream(audio_path, colors, sample_rate, duration, output_vide
         messagebox.showerror("Error", f"Failed to generate video.\n{e}")
 
 def start_encoding(audio_path, output_video, frame_rate, resolution, strip_width):
-    hex_codes, sample_rate, duration = audio_to_hex(audio_path)
-    if hex_codes:
-        print("Converting hex codes to colors...")
-        colors = generate_color_strip(hex_codes)
+    colors, sample_rate, duration = audio_to_rgb(audio_path)
+    if colors is not None:
         print("Starting video generation...")
         generate_video_stream(audio_path, colors, sample_rate, duration, output_video, frame_rate, resolution, strip_width)
 
@@ -209,6 +258,77 @@ def read_video_extract_samples(video_path, strip_width, samples_per_frame):
 
     return samples
 
+def iter_video_frames(cap):
+    """
+    Yields BGR frames one at a time straight from an opened capture.
+    """
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame
+    finally:
+        cap.release()
+
+def frame_to_samples(frame, strip_width):
+    """
+    Recovers the signed 24-bit samples of one BGR frame by sampling every strip
+    center on the middle row with a single fancy-indexing gather.
+    """
+    samples_in_frame = frame.shape[1] // strip_width
+    xs = np.arange(samples_in_frame) * strip_width + strip_width // 2
+    pixels = frame[frame.shape[0] // 2, xs].astype(np.int32)
+
+    # OpenCV frames are BGR, so R is the last channel
+    sample_int = (pixels[:, 2] << 16) | (pixels[:, 1] << 8) | pixels[:, 0]
+
+    # Sign extension for negative values
+    return sample_int - ((sample_int & 0x800000) << 1)
+
+def read_video_extract_samples_fast(video_path, strip_width, samples_per_frame):
+    # Open the video file
+    cap = cv2.VideoCapture(video_path)
+
+    if not cap.isOpened():
+        print("Error opening video file.")
+        return None
+
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+    print(f"Total frames: {total_frames}")
+    print(f"Samples per frame: {samples_per_frame}")
+
+    chunks = []
+    for frame_count, frame in enumerate(iter_video_frames(cap), start=1):
+        chunks.append(frame_to_samples(frame, strip_width))
+        if frame_count % 100 == 0:
+            print(f"Processed {frame_count}/{total_frames} frames")
+
+    samples = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int32)
+
+    # Normalize samples to [-1, 1]
+    max_amplitude = 2**23 - 1
+    return samples / max_amplitude
+
+def benchmark_decoding(video_path, strip_width, samples_per_frame):
+    """
+    Times the per-pixel decoder against the vectorized one on the same video
+    and prints the throughput of each in decoded samples per second.
+    """
+    results = {}
+    for name, decoder in (("per-pixel", read_video_extract_samples),
+                          ("vectorized", read_video_extract_samples_fast)):
+        start = time.perf_counter()
+        samples = decoder(video_path, strip_width=strip_width, samples_per_frame=samples_per_frame)
+        elapsed = time.perf_counter() - start
+        if samples is None:
+            return None
+        results[name] = len(samples) / elapsed if elapsed > 0 else float('inf')
+        print(f"{name}: {len(samples)} samples in {elapsed:.3f} s ({results[name]:.0f} samples/s)")
+    print(f"Speedup: {results['vectorized'] / results['per-pixel']:.1f}x")
+    return results
+
 def start_decoding(video_path, output_audio_path):
     # Read metadata
     params = read_metadata(video_path)
@@ -259,8 +379,8 @@ def start_decoding(video_path, output_audio_path):
     )
     decoding_thread.start()
 
-def decode_samples(video_path, output_audio_path, sample_rate, strip_width, samples_per_frame):
-    samples = read_video_extract_samples(video_path, strip_width=strip_width, samples_per_frame=samples_per_frame)
+def decode_samples(video_path, output_audio_path, sample_rate, strip_width, samples_per_frame=None):
+    samples = read_video_extract_samples_fast(video_path, strip_width=strip_width, samples_per_frame=samples_per_frame)
     if samples is not None:
         print(f"Writing audio file to {output_audio_path}")
         try:
@@ -1,28 +1,186 @@
 from ursina import *
 from ursina.prefabs.first_person_controller import FirstPersonController
-class Voxel(Button):
-    def __init__(self, position = (0,0,0)):
-        super().__init__(
-            parent = scene,
-            position = position,
-            model = 'cube',
-            origin_y = 0.5,
-            texture = 'brick',
-            color = color.color(.6,.3,random.uniform(0.9,1), 1,),
-            highlight_color = color.lime)
-        
-    def input(self,key):
-        if self.hovered:
-            if key == 'right mouse down':
-                voxel = Voxel(position = self.position + mouse.normal)
-
-            if key == 'left mouse down':
-                destroy(self)
-        
+import numpy as np
+import math
+import sys
+
+GROUND_SIZE = int(sys.argv[1]) if len(sys.argv) > 1 else 20  # Blocks per side of the starting floor
+WORLD_HEIGHT = 32  # Starting height; the world grows when blocks are placed outside it
+CHUNK_SIZE = 16    # Blocks per side of a chunk column
+REACH = 16         # How far away blocks can be picked
+
+# Voxel (i, j, k) fills [i - .5, i + .5] x [j - 1, j] x [k - .5, k + .5], like a cube with origin_y = .5
+VOXEL_OFFSET = np.array([-.5, -1, -.5])
+
+# Each face: neighbor direction and its corners in the unit cube, wound so the face is seen from outside
+FACES = [
+    ((1, 0, 0), [(1, 0, 0), (1, 0, 1), (1, 1, 1), (1, 1, 0)]),
+    ((-1, 0, 0), [(0, 0, 0), (0, 1, 0), (0, 1, 1), (0, 0, 1)]),
+    ((0, 1, 0), [(0, 1, 0), (1, 1, 0), (1, 1, 1), (0, 1, 1)]),
+    ((0, -1, 0), [(0, 0, 0), (0, 0, 1), (1, 0, 1), (1, 0, 0)]),
+    ((0, 0, 1), [(0, 0, 1), (0, 1, 1), (1, 1, 1), (1, 0, 1)]),
+    ((0, 0, -1), [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]),
+]
+FACE_UVS = np.array([(0, 0), (1, 0), (1, 1), (0, 1)], dtype=float)
+QUAD_TRIANGLES = np.array([0, 1, 2, 2, 3, 0])
+
+class VoxelWorld:
+    """
+    Blocks live in a numpy occupancy array split into chunk columns. Each chunk is one Entity
+    with a single mesh of its exposed faces, and an edit only rebuilds the chunks it touches.
+    Placing a block outside the array pads it, so building isn't limited to the starting area.
+    """
+
+    def __init__(self, size_x, size_z, height=WORLD_HEIGHT, chunk_size=CHUNK_SIZE):
+        self.occupied = np.zeros((size_x, height, size_z), dtype=bool)
+        self.origin = np.zeros(3, dtype=int)  # World cell of occupied[0, 0, 0]; x and z stay chunk aligned
+        # Per-block shade index, standing in for each old Voxel's random color
+        self.palette = np.array([tuple(color.color(.6, .3, v, 1)) for v in np.linspace(.9, 1, 8)])
+        self.shades = np.random.randint(len(self.palette), size=self.occupied.shape).astype(np.uint8)
+        self.chunk_size = chunk_size
+        self.chunks = {}
+        self.dirty = set()
+
+    def chunk_key(self, x, z):
+        return x // self.chunk_size, z // self.chunk_size
+
+    def index(self, cell):
+        return tuple(int(c - o) for c, o in zip(cell, self.origin))
+
+    def in_bounds(self, cell):
+        return all(0 <= i < n for i, n in zip(self.index(cell), self.occupied.shape))
+
+    def grow_to(self, cell):
+        # Pad in whole chunks on every side the cell falls outside of
+        size = self.chunk_size
+        pad = []
+        for i, n in zip(self.index(cell), self.occupied.shape):
+            below = -(i // size) * size if i < 0 else 0
+            above = ((i - n) // size + 1) * size if i >= n else 0
+            pad.append((below, above))
+        self.occupied = np.pad(self.occupied, pad)
+        shades = np.random.randint(len(self.palette), size=self.occupied.shape).astype(np.uint8)
+        shades[tuple(slice(lo, lo + n) for (lo, _), n in zip(pad, self.shades.shape))] = self.shades
+        self.shades = shades
+        self.origin -= [lo for lo, _ in pad]
+        # Chunk borders and the solid floor below the array moved, so every mesh is stale
+        self.mark_all_dirty()
+
+    def set_block(self, cell, solid):
+        if not self.in_bounds(cell):
+            if not solid:
+                return
+            self.grow_to(cell)
+        index = self.index(cell)
+        if self.occupied[index] == solid:
+            return
+        self.occupied[index] = solid
+        x, y, z = cell
+        # Neighboring chunks share the faces along their border
+        for dx, dz in ((0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)):
+            if self.in_bounds((x + dx, y, z + dz)):
+                self.dirty.add(self.chunk_key(x + dx, z + dz))
+
+    def mark_all_dirty(self):
+        (x0, _, z0), (size_x, _, size_z) = self.origin, self.occupied.shape
+        self.dirty.update(self.chunk_key(x, z) for x in range(x0, x0 + size_x, self.chunk_size)
+                          for z in range(z0, z0 + size_z, self.chunk_size))
+
+    def rebuild_dirty(self):
+        for key in self.dirty:
+            if key not in self.chunks:
+                self.chunks[key] = Entity(texture='brick')
+            self.build_chunk(self.chunks[key], *key)
+        self.dirty.clear()
+
+    def build_chunk(self, chunk, cx, cz):
+        size = self.chunk_size
+        ox, oy, oz = self.origin
+        x0, z0 = cx * size - ox, cz * size - oz  # Array indices of the chunk corner
+        region = self.occupied[x0:x0 + size, :, z0:z0 + size]
+        w, h, d = region.shape
+
+        # Region plus a one block border taken from the neighbors; below the floor counts as solid
+        padded = np.zeros((w + 2, h + 2, d + 2), dtype=bool)
+        padded[:, 0, :] = True
+        lo_x, lo_z = max(x0 - 1, 0), max(z0 - 1, 0)
+        hi_x, hi_z = min(x0 + w + 1, self.occupied.shape[0]), min(z0 + d + 1, self.occupied.shape[2])
+        padded[lo_x - x0 + 1:hi_x - x0 + 1, 1:-1, lo_z - z0 + 1:hi_z - z0 + 1] = self.occupied[lo_x:hi_x, :, lo_z:hi_z]
+
+        vertices, colors = [], []
+        for (nx, ny, nz), corners in FACES:
+            neighbor = padded[1 + nx:w + 1 + nx, 1 + ny:h + 1 + ny, 1 + nz:d + 1 + nz]
+            cells = np.argwhere(region & ~neighbor)
+            if not len(cells):
+                continue
+            origins = cells + (x0 + ox, oy, z0 + oz) + VOXEL_OFFSET
+            vertices.append((origins[:, None, :] + np.array(corners)[None, :, :]).reshape(-1, 3))
+            shade = self.palette[self.shades[cells[:, 0] + x0, cells[:, 1], cells[:, 2] + z0]]
+            colors.append(np.repeat(shade, 4, axis=0))
+
+        if not vertices:
+            chunk.model = None
+            chunk.collider = None
+            return
+        vertices = np.concatenate(vertices)
+        quads = len(vertices) // 4
+        triangles = (np.arange(quads)[:, None] * 4 + QUAD_TRIANGLES).ravel()
+        chunk.model = Mesh(vertices=vertices.tolist(), triangles=triangles.tolist(),
+                           uvs=np.tile(FACE_UVS, (quads, 1)).tolist(), colors=np.concatenate(colors).tolist())
+        chunk.collider = 'mesh'  # Only used to keep the player on the ground; picking uses raycast_block
+
+    def raycast_block(self, origin, direction, max_distance=REACH):
+        """Step through the grid from origin (3D DDA) and return (block, face normal) of the first solid block."""
+        position = [origin[i] - VOXEL_OFFSET[i] for i in range(3)]
+        cell = [math.floor(p) for p in position]
+        step, t_max, t_delta = [0, 0, 0], [math.inf] * 3, [math.inf] * 3
+        for i in range(3):
+            if direction[i] > 0:
+                step[i] = 1
+                t_max[i] = (cell[i] + 1 - position[i]) / direction[i]
+            elif direction[i] < 0:
+                step[i] = -1
+                t_max[i] = (position[i] - cell[i]) / -direction[i]
+            if step[i]:
+                t_delta[i] = 1 / abs(direction[i])
+
+        normal = (0, 0, 0)
+        distance = 0
+        while distance <= max_distance:
+            if self.in_bounds(cell) and self.occupied[self.index(cell)]:
+                return tuple(cell), normal
+            axis = t_max.index(min(t_max))
+            distance = t_max[axis]
+            cell[axis] += step[axis]
+            t_max[axis] += t_delta[axis]
+            normal = tuple(-step[axis] if i == axis else 0 for i in range(3))
+        return None, None
+
 app = Ursina()
 
-for z in range(20):
-    for x in range(20):
-        voxel = Voxel(position = (x,0,z))
-player = FirstPersonController()
+world = VoxelWorld(GROUND_SIZE, GROUND_SIZE)
+world.occupied[:, 0, :] = True
+world.mark_all_dirty()
+world.rebuild_dirty()
+
+highlight = Entity(model='wireframe_cube', origin_y=.5, scale=1.01, color=color.lime, enabled=False)
+target_block, target_normal = None, None
+
+def update():
+    global target_block, target_normal
+    target_block, target_normal = world.raycast_block(camera.world_position, camera.forward)
+    highlight.enabled = target_block is not None
+    if target_block is not None:
+        highlight.position = target_block
+    world.rebuild_dirty()
+
+def input(key):
+    if target_block is None:
+        return
+    if key == 'right mouse down' and any(target_normal):
+        world.set_block(tuple(b + n for b, n in zip(target_block, target_normal)), True)
+    if key == 'left mouse down':
+        world.set_block(target_block, False)
+
+player = FirstPersonController(position=(GROUND_SIZE / 2, 0, GROUND_SIZE / 2))
 app.run()
@@ -5,14 +5,23 @@ from transformers import GPT2LMHeadModel, GPT2Tokenizer
 model_name = 'gpt2'
 tokenizer = GPT2Tokenizer.from_pretrained(model_name)
 model = GPT2LMHeadModel.from_pretrained(model_name)
+model.eval()
 
-# Function to generate words using GPT-2
-def generate_words_gpt2(prompt, num_words=5):
+# Batched prompts are left-padded so every row's next token lands in the last column
+tokenizer.pad_token = tokenizer.eos_token
+tokenizer.padding_side = 'left'
+
+# Components already generated per (item name, num_words, do_sample), shared across trees
+components_cache = {}
+
+# Function to generate words using GPT-2; greedy decoding gives at most one word per prompt, sampling can give more
+def generate_words_gpt2(prompt, num_words=5, do_sample=False):
     input_ids = tokenizer.encode(prompt, return_tensors='pt')
     generated_words = set()
     
     for _ in range(num_words * 3):  # Generate more sequences to ensure uniqueness
-        output = model.generate(input_ids, max_length=len(input_ids[0]) + 1, num_return_sequences=1, pad_token_id=tokenizer.eos_token_id)
+        with torch.no_grad():
+            output = model.generate(input_ids, max_length=len(input_ids[0]) + 1, do_sample=do_sample, num_return_sequences=1, pad_token_id=tokenizer.eos_token_id)
         generated_text = tokenizer.decode(output[0], skip_special_tokens=True)
         word = generated_text.split()[-1]
         if word not in prompt.split():  # Ensure the word is new
@@ -22,8 +31,45 @@ def generate_words_gpt2(prompt, num_words=5):
     
     return list(generated_words)[:num_words]
 
+# Function to generate words for many prompts with a single padded GPT-2 call
+def generate_words_gpt2_batch(prompts, num_words=5, do_sample=False):
+    if not prompts:
+        return {}
+    # Sample more sequences than needed to ensure uniqueness; greedy decoding only has one to give
+    candidates = num_words * 3 if do_sample else 1
+    inputs = tokenizer(prompts, return_tensors='pt', padding=True)
+    with torch.no_grad():
+        output = model.generate(**inputs, max_new_tokens=1, do_sample=do_sample, num_return_sequences=candidates, pad_token_id=tokenizer.eos_token_id)
+    # Rows come back grouped by prompt, candidates rows each
+    new_tokens = tokenizer.batch_decode(output[:, -1:], skip_special_tokens=True)
+
+    words = {}
+    for i, prompt in enumerate(prompts):
+        generated_words = []
+        for token in new_tokens[i * candidates:(i + 1) * candidates]:
+            generated_text = (prompt + token).split()
+            if not generated_text:
+                continue
+            word = generated_text[-1]
+            if word not in prompt.split() and word not in generated_words:  # Ensure the word is new
+                generated_words.append(word)
+            if len(generated_words) >= num_words:
+                break
+        words[prompt] = generated_words
+    return words
+
+# Function to look up components, generating only the item names not seen before
+def generate_components_cached(words, num_words=2, do_sample=False):
+    missing = [word for word in dict.fromkeys(words) if (word, num_words, do_sample) not in components_cache]
+    for word, components in generate_words_gpt2_batch(missing, num_words, do_sample).items():
+        components_cache[(word, num_words, do_sample)] = components
+    return {word: components_cache[(word, num_words, do_sample)] for word in words}
+
 # Function to generate a fake crafting tree using GPT-2
-def generate_fake_crafting_tree_gpt2(target_word, max_depth=3):
+def generate_fake_crafting_tree_gpt2(target_word, max_depth=3, batched=True, do_sample=False):
+    if batched:
+        return generate_fake_crafting_tree_gpt2_batched(target_word, max_depth, do_sample)
+
     # Initialize the tree
     tree = {target_word: []}
     
@@ -31,7 +77,7 @@ def generate_fake_crafting_tree_gpt2(target_word, max_depth=3):
         if depth == 0 or current_word in visited:
             return
         visited.add(current_word)
-        components = generate_words_gpt2(current_word, num_words=2)
+        components = generate_words_gpt2(current_word, num_words=2, do_sample=do_sample)
         if not components:  # If no meaningful components, return
             return
         tree[current_word] = components
@@ -41,13 +87,32 @@ def generate_fake_crafting_tree_gpt2(target_word, max_depth=3):
     add_to_tree(target_word, max_depth, set())
     return tree
 
+# Function to generate a fake crafting tree one level at a time, one model call per level
+def generate_fake_crafting_tree_gpt2_batched(target_word, max_depth=3, do_sample=False):
+    tree = {target_word: []}
+    visited = set()
+    level = [target_word]
+    for _ in range(max_depth):
+        level = [word for word in dict.fromkeys(level) if word not in visited]
+        if not level:
+            break
+        visited.update(level)
+        components = generate_components_cached(level, num_words=2, do_sample=do_sample)
+        next_level = []
+        for word in level:
+            if components[word]:  # Words without meaningful components stay leaves
+                tree[word] = components[word]
+                next_level.extend(components[word])
+        level = next_level
+    return tree
+
 # Function to display the crafting tree
-def display_crafting_tree(tree, word, depth=0):
-    if word not in tree:
+def display_crafting_tree(tree, word, depth=0, path=()):
+    if word not in tree or word in path:  # Stop at leaves and at components that loop back
         return f"{' ' * depth * 2}{word}\n"
     result = f"{' ' * depth * 2}{word}\n"
     for component in tree[word]:
-        result += display_crafting_tree(tree, component, depth + 1)
+        result += display_crafting_tree(tree, component, depth + 1, path + (word,))
     return result
 
 # Main function
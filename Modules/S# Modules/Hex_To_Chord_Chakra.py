@@ -4,6 +4,7 @@ import tkinter as tk
 from tkinter import messagebox
 import random
 import threading
+import time
 
 # Frequencies for chakras (out of tune notes)
 chakra_frequencies = {
@@ -47,9 +48,31 @@ def apply_reverb(audio, sample_rate, decay=1.01, delay=0.05, feedback_loops=50):
     
     max_amplitude = np.iinfo(np.int16).max
     
+    # Each sample only feeds back into the one delay_samples later, so a whole delay-length
+    # block can be updated from the block before it, clipping included
+    if delay_samples > 0:
+        for start in range(delay_samples, len(reverb_audio), delay_samples):
+            block = reverb_audio[start:start + delay_samples]
+            block += decay * reverb_audio[start - delay_samples:start - delay_samples + len(block)]
+            # Prevent clipping
+            np.clip(block, -max_amplitude, max_amplitude, out=block)
+    else:
+        # With no delay every sample feeds back into itself once
+        reverb_audio += decay * reverb_audio
+        np.clip(reverb_audio, -max_amplitude, max_amplitude, out=reverb_audio)
+    
+    return reverb_audio.astype(np.int16)
+
+# Per-sample version of apply_reverb, kept as the reference for benchmark_reverb
+def apply_reverb_reference(audio, sample_rate, decay=1.01, delay=0.05, feedback_loops=50):
+    delay_samples = int(sample_rate * delay)
+    reverb_audio = np.zeros(len(audio) + delay_samples * feedback_loops)
+    reverb_audio[:len(audio)] = audio
+    
+    max_amplitude = np.iinfo(np.int16).max
+    
     for i in range(delay_samples, len(reverb_audio)):
         reverb_audio[i] += decay * reverb_audio[i - delay_samples]
-        # Prevent clipping
         if reverb_audio[i] > max_amplitude:
             reverb_audio[i] = max_amplitude
         elif reverb_audio[i] < -max_amplitude:
@@ -57,18 +80,34 @@ def apply_reverb(audio, sample_rate, decay=1.01, delay=0.05, feedback_loops=50):
     
     return reverb_audio.astype(np.int16)
 
+# Function to compare reverb render time per second of output audio
+def benchmark_reverb(duration=2, decay=0.99, sample_rate=44100):
+    wave = generate_sine_wave(chakra_frequencies['A'], duration, sample_rate)
+    results = {}
+    for name, reverb in (('reference', apply_reverb_reference), ('block', apply_reverb)):
+        start = time.perf_counter()
+        output = reverb(wave, sample_rate, decay=decay, delay=0.05)
+        elapsed = time.perf_counter() - start
+        results[name] = output
+        print(f"{name}: {elapsed / (len(output) / sample_rate) * 1000:.3f} ms per second of audio")
+    print("Outputs match:", np.array_equal(results['reference'], results['block']))
+    return results
+
 # Function to play an ambient soundscape
 def play_ambient_soundscape(colors, duration=2, decay=1.01):
     sample_rate = 44100
     combined_audio_length = int(sample_rate * (duration + duration * 10))  # Add reverb tail length
     combined_audio = np.zeros(combined_audio_length)
+    rendered = {}  # Colors sharing a chakra note render the same audio
 
     for color in colors:
         if color in key_colors:
             key_note = key_colors[color]
-            frequency = chakra_frequencies[key_note]
-            wave = generate_sine_wave(frequency, duration, sample_rate)
-            wave_with_reverb = apply_reverb(wave, sample_rate, decay=decay, delay=0.05)
+            if key_note not in rendered:
+                frequency = chakra_frequencies[key_note]
+                wave = generate_sine_wave(frequency, duration, sample_rate)
+                rendered[key_note] = apply_reverb(wave, sample_rate, decay=decay, delay=0.05)
+            wave_with_reverb = rendered[key_note]
             combined_audio[:len(wave_with_reverb)] += wave_with_reverb
 
     combined_audio = (combined_audio / len(colors)).astype(np.int16)
@@ -9,6 +9,10 @@ class Camera:
         self.pitch = pitch
         self.speed = 0.1
         self.sensitivity = 0.1
+        # Front and right vectors for the last (yaw, pitch) they were computed for
+        self._cached_angles = None
+        self._front = None
+        self._right = None
 
     def get_view_matrix(self):
         yaw_rad = radians(self.yaw)
@@ -52,7 +56,10 @@ class Camera:
         if self.pitch < -89:
             self.pitch = -89
 
-    def get_front(self):
+    def _update_vectors(self):
+        # Recomputed only after the view angles change, so repeated calls in a frame are free
+        if self._cached_angles == (self.yaw, self.pitch):
+            return
         yaw_rad = radians(self.yaw)
         pitch_rad = radians(self.pitch)
         front = np.array([
@@ -60,9 +67,15 @@ class Camera:
             sin(pitch_rad),
             sin(yaw_rad) * cos(pitch_rad)
         ])
-        return front / np.linalg.norm(front)
+        self._front = front / np.linalg.norm(front)
+        right = np.cross(self._front, [0, 1, 0])
+        self._right = right / np.linalg.norm(right)
+        self._cached_angles = (self.yaw, self.pitch)
+
+    def get_front(self):
+        self._update_vectors()
+        return self._front
 
     def get_right(self):
-        front = self.get_front()
-        right = np.cross(front, [0, 1, 0])
-        return right / np.linalg.norm(right)
+        self._update_vectors()
+        return self._right
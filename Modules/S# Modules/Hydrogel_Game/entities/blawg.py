@@ -1,46 +1,51 @@
 from OpenGL.GL import *
+import numpy as np
+from entities.mesh import draw_vertices
 
 class Blawg:
-    def __init__(self, x, y, z):
-        self.position = (x, y, z)
-
-    def draw(self):
-        glPushMatrix()
-        glTranslatef(*self.position)
-        glColor3f(1, 0, 0)
-        glBegin(GL_QUADS)
+    mode = GL_QUADS
+    color = (1, 0, 0)
+    vertices = np.array([
         # Front face
-        glVertex3f(-0.5, -0.5,  0.5)
-        glVertex3f( 0.5, -0.5,  0.5)
-        glVertex3f( 0.5,  0.5,  0.5)
-        glVertex3f(-0.5,  0.5,  0.5)
+        (-0.5, -0.5,  0.5),
+        ( 0.5, -0.5,  0.5),
+        ( 0.5,  0.5,  0.5),
+        (-0.5,  0.5,  0.5),
         # Back face
-        glVertex3f(-0.5, -0.5, -0.5)
-        glVertex3f(-0.5,  0.5, -0.5)
-        glVertex3f( 0.5,  0.5, -0.5)
-        glVertex3f( 0.5, -0.5, -0.5)
+        (-0.5, -0.5, -0.5),
+        (-0.5,  0.5, -0.5),
+        ( 0.5,  0.5, -0.5),
+        ( 0.5, -0.5, -0.5),
         # Left face
-        glVertex3f(-0.5, -0.5, -0.5)
-        glVertex3f(-0.5, -0.5,  0.5)
-        glVertex3f(-0.5,  0.5,  0.5)
-        glVertex3f(-0.5,  0.5, -0.5)
+        (-0.5, -0.5, -0.5),
+        (-0.5, -0.5,  0.5),
+        (-0.5,  0.5,  0.5),
+        (-0.5,  0.5, -0.5),
         # Right face
-        glVertex3f( 0.5, -0.5, -0.5)
-        glVertex3f( 0.5,  0.5, -0.5)
-        glVertex3f( 0.5,  0.5,  0.5)
-        glVertex3f( 0.5, -0.5,  0.5)
+        ( 0.5, -0.5, -0.5),
+        ( 0.5,  0.5, -0.5),
+        ( 0.5,  0.5,  0.5),
+        ( 0.5, -0.5,  0.5),
         # Top face
-        glVertex3f(-0.5,  0.5, -0.5)
-        glVertex3f(-0.5,  0.5,  0.5)
-        glVertex3f( 0.5,  0.5,  0.5)
-        glVertex3f( 0.5,  0.5, -0.5)
+        (-0.5,  0.5, -0.5),
+        (-0.5,  0.5,  0.5),
+        ( 0.5,  0.5,  0.5),
+        ( 0.5,  0.5, -0.5),
         # Bottom face
-        glVertex3f(-0.5, -0.5, -0.5)
-        glVertex3f( 0.5, -0.5, -0.5)
-        glVertex3f( 0.5, -0.5,  0.5)
-        glVertex3f(-0.5, -0.5,  0.5)
-        glEnd()
-        glPopMatrix()
+        (-0.5, -0.5, -0.5),
+        ( 0.5, -0.5, -0.5),
+        ( 0.5, -0.5,  0.5),
+        (-0.5, -0.5,  0.5),
+    ], dtype=np.float32)
+    # Quads are independent, so many Blawgs batch as they are
+    batch_mode = GL_QUADS
+    batch_vertices = vertices
+
+    def __init__(self, x, y, z):
+        self.position = (x, y, z)
+
+    def draw(self):
+        draw_vertices(self.position, self.color, self.mode, self.vertices)
 
     def update(self):
         pass
@@ -0,0 +1,19 @@
+from OpenGL.GL import *
+import numpy as np
+
+def draw_vertices(position, color, mode, vertices):
+    # Draws one entity from its prebuilt vertex array instead of one glVertex3f call per vertex
+    glPushMatrix()
+    glTranslatef(*position)
+    glColor3f(*color)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, vertices)
+    glDrawArrays(mode, 0, len(vertices))
+    glDisableClientState(GL_VERTEX_ARRAY)
+    glPopMatrix()
+
+def fan_to_triangles(vertices):
+    # A triangle fan can't be concatenated with other fans, so batches use the same triangles listed out
+    center = vertices[0]
+    triangles = [(center, vertices[i], vertices[i + 1]) for i in range(1, len(vertices) - 1)]
+    return np.array(triangles, dtype=np.float32).reshape(-1, 3)
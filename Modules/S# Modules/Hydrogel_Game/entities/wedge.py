@@ -1,29 +1,33 @@
 from OpenGL.GL import *
+import numpy as np
+from entities.mesh import draw_vertices
 
 class Wedge:
+    mode = GL_TRIANGLES
+    color = (0, 1, 0)
+    vertices = np.array([
+        # Simplified icosahedron vertices
+        (0, 1, 0),
+        (-1, -1, 1),
+        (1, -1, 1),
+        (0, 1, 0),
+        (1, -1, 1),
+        (1, -1, -1),
+        (0, 1, 0),
+        (1, -1, -1),
+        (-1, -1, -1),
+        (0, 1, 0),
+        (-1, -1, -1),
+        (-1, -1, 1),
+    ], dtype=np.float32)
+    batch_mode = GL_TRIANGLES
+    batch_vertices = vertices
+
     def __init__(self, x, y, z):
         self.position = (x, y, z)
 
     def draw(self):
-        glPushMatrix()
-        glTranslatef(*self.position)
-        glColor3f(0, 1, 0)
-        glBegin(GL_TRIANGLES)
-        # Simplified icosahedron vertices
-        glVertex3f(0, 1, 0)
-        glVertex3f(-1, -1, 1)
-        glVertex3f(1, -1, 1)
-        glVertex3f(0, 1, 0)
-        glVertex3f(1, -1, 1)
-        glVertex3f(1, -1, -1)
-        glVertex3f(0, 1, 0)
-        glVertex3f(1, -1, -1)
-        glVertex3f(-1, -1, -1)
-        glVertex3f(0, 1, 0)
-        glVertex3f(-1, -1, -1)
-        glVertex3f(-1, -1, 1)
-        glEnd()
-        glPopMatrix()
+        draw_vertices(self.position, self.color, self.mode, self.vertices)
 
     def update(self):
         pass
@@ -1,22 +1,28 @@
 from OpenGL.GL import *
+import numpy as np
 import math
+from entities.mesh import draw_vertices, fan_to_triangles
+
+def circle_fan(num_segments=36, radius=0.5):
+    vertices = [(0, 0, 0)]  # Center of circle
+    for i in range(num_segments + 1):
+        angle = i * 2 * math.pi / num_segments
+        vertices.append((math.cos(angle) * radius, math.sin(angle) * radius, 0))
+    return np.array(vertices, dtype=np.float32)
 
 class Womp:
+    # The circle is computed once for every Womp instead of every frame
+    mode = GL_TRIANGLE_FAN
+    color = (0, 0, 1)
+    vertices = circle_fan()
+    batch_mode = GL_TRIANGLES
+    batch_vertices = fan_to_triangles(vertices)
+
     def __init__(self, x, y, z):
         self.position = (x, y, z)
 
     def draw(self):
-        glPushMatrix()
-        glTranslatef(*self.position)
-        glColor3f(0, 0, 1)
-        glBegin(GL_TRIANGLE_FAN)
-        glVertex3f(0, 0, 0)  # Center of circle
-        num_segments = 36
-        for i in range(num_segments + 1):
-            angle = i * 2 * math.pi / num_segments
-            glVertex3f(math.cos(angle) * 0.5, math.sin(angle) * 0.5, 0)
-        glEnd()
-        glPopMatrix()
+        draw_vertices(self.position, self.color, self.mode, self.vertices)
 
     def update(self):
         pass
@@ -1,11 +1,18 @@
 import pygame
 import sys
+import argparse
+import time
 import numpy as np
 from OpenGL.GL import *
 from OpenGL.GLU import *
 from camera import Camera
 from world import World
 
+parser = argparse.ArgumentParser(description="4D Hydrogel Game")
+parser.add_argument('--stress', type=int, metavar='ENTITIES',
+                    help='Fill the world with this many random entities and report frame times')
+args = parser.parse_args()
+
 # Initialize Pygame
 pygame.init()
 
@@ -20,7 +27,7 @@ clock = pygame.time.Clock()
 
 # Initialize camera and world
 camera = Camera(position=(0, 0, 5))
-world = World()
+world = World.populate(args.stress) if args.stress else World()
 
 # OpenGL settings
 glEnable(GL_DEPTH_TEST)
@@ -32,10 +39,15 @@ glMatrixMode(GL_MODELVIEW)
 pygame.mouse.set_visible(False)
 pygame.event.set_grab(True)
 
+# Frame time reporting for stress mode
+frame_times = []
+last_report = time.perf_counter()
+
 # Game loop
 running = True
 while running:
     delta_time = clock.tick(FPS) / 1000.0
+    frame_start = time.perf_counter()
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
@@ -51,9 +63,10 @@ while running:
     # Render
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
     glLoadIdentity()
+    front = camera.get_front()
     gluLookAt(
         camera.position[0], camera.position[1], camera.position[2],
-        camera.position[0] + camera.get_front()[0], camera.position[1] + camera.get_front()[1], camera.position[2] + camera.get_front()[2],
+        camera.position[0] + front[0], camera.position[1] + front[1], camera.position[2] + front[2],
         0, 1, 0
     )
 
@@ -62,5 +75,14 @@ while running:
     # Display update
     pygame.display.flip()
 
+    if args.stress:
+        # Work time per frame, not counting the wait in clock.tick
+        frame_times.append(time.perf_counter() - frame_start)
+        if time.perf_counter() - last_report >= 1.0:
+            print(f"{len(world.entities)} entities: {np.mean(frame_times) * 1000:.2f} ms/frame avg, "
+                  f"{np.max(frame_times) * 1000:.2f} ms max, {clock.get_fps():.1f} FPS")
+            frame_times = []
+            last_report = time.perf_counter()
+
 pygame.quit()
 sys.exit()
@@ -4,16 +4,72 @@ from entities.blawg import Blawg
 from entities.wedge import Wedge
 from entities.womp import Womp
 
+ENTITY_TYPES = (Blawg, Wedge, Womp)
+
 class World:
-    def __init__(self):
-        self.entities = [
-            Blawg(0, 0, 0),
-            Wedge(1, 1, 1),
-            Womp(-1, -1, -1)
-        ]
+    def __init__(self, entities=None):
+        if entities is None:
+            entities = [
+                Blawg(0, 0, 0),
+                Wedge(1, 1, 1),
+                Womp(-1, -1, -1)
+            ]
+        self.entities = entities
+        # One static VBO per entity type holding every instance's vertices already in place
+        self.batches = []  # (buffer, mode, color, vertex count)
+        self.unbatched = []  # Entities of any other type (subclasses included) still draw themselves
+        self.batched_count = 0
+        self.dirty = True
+
+    @classmethod
+    def populate(cls, count, spread=20, seed=None):
+        # Scatters count random entities through a cube, for stress testing
+        rng = np.random.default_rng(seed)
+        types = rng.integers(len(ENTITY_TYPES), size=count)
+        positions = rng.uniform(-spread, spread, size=(count, 3))
+        return cls([ENTITY_TYPES[t](*position) for t, position in zip(types, positions.tolist())])
+
+    def add_entity(self, entity):
+        self.entities.append(entity)
+        self.dirty = True
+
+    def mark_dirty(self):
+        # Call after moving an entity so its batch picks up the new position
+        self.dirty = True
+
+    def build_batches(self):
+        if self.batches:
+            glDeleteBuffers(len(self.batches), [batch[0] for batch in self.batches])
+        self.batches = []
+        self.unbatched = [entity for entity in self.entities if type(entity) not in ENTITY_TYPES]
+        for entity_type in ENTITY_TYPES:
+            positions = np.array([entity.position for entity in self.entities if type(entity) is entity_type],
+                                 dtype=np.float32).reshape(-1, 3)
+            if not len(positions):
+                continue
+            vertices = (entity_type.batch_vertices[None, :, :] + positions[:, None, :]).reshape(-1, 3)
+            buffer = glGenBuffers(1)
+            glBindBuffer(GL_ARRAY_BUFFER, buffer)
+            glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+            self.batches.append((buffer, entity_type.batch_mode, entity_type.color, len(vertices)))
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.batched_count = len(self.entities)
+        self.dirty = False
 
     def draw(self):
-        for entity in self.entities:
+        # Buffers are built on first draw, once the GL context exists; entities appended
+        # straight to self.entities are picked up by the count changing
+        if self.dirty or self.batched_count != len(self.entities):
+            self.build_batches()
+        glEnableClientState(GL_VERTEX_ARRAY)
+        for buffer, mode, color, count in self.batches:
+            glBindBuffer(GL_ARRAY_BUFFER, buffer)
+            glVertexPointer(3, GL_FLOAT, 0, None)
+            glColor3f(*color)
+            glDrawArrays(mode, 0, count)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        for entity in self.unbatched:
             entity.draw()
 
     def update(self):
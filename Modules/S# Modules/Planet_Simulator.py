@@ -21,9 +21,6 @@ RENDER_WIDTH = int(RENDER_HEIGHT * aspect_ratio)
 SCREEN = pygame.display.set_mode((screen_width, screen_height), pygame.FULLSCREEN)
 pygame.display.set_caption("Planetary Interactive Simulation System")
 
-# Create a render surface with the desired rendering resolution
-render_surface = pygame.Surface((RENDER_WIDTH, RENDER_HEIGHT))
-
 # Clock for controlling FPS
 CLOCK = pygame.time.Clock()
 
@@ -72,142 +69,142 @@ clouds_noise_image_base = (clouds_noise_image_base - clouds_noise_image_base.min
 PLANET_POS_X = RENDER_WIDTH // 2    # Centered horizontally
 PLANET_POS_Y = RENDER_HEIGHT // 2   # Centered vertically
 
+# Terrain type thresholds and colors
+water_threshold = 0.4
+mountain_threshold = 0.7
+snow_threshold = 0.85
+terrain_palette = np.array([water_color, land_color, mountain_color, snow_color], dtype=float)
+
+# Terrain type and city light flags per texel, flattened for gathers
+terrain_type_image = np.digitize(terrain_noise_image, [water_threshold, mountain_threshold, snow_threshold], right=True).ravel()
+city_lights_image = (city_noise_image > 0.8).ravel()
+
+class PlanetGeometry:
+    """
+    Per-pixel sphere geometry for one planet size, computed once. Spinning about the polar
+    axis leaves latitude fixed and only shifts longitude, and the lighting is a fixed mix of
+    the rotation angle's cosine and sine, so frames never touch normals or trig again.
+    """
+
+    _cache = {}
+
+    def __init__(self, width, height, pos_x, pos_y, radius, cloud_radius):
+        # Coordinate grid centered at the planet's position
+        y_indices, x_indices = np.indices((height, width))
+        x = x_indices - pos_x
+        y = y_indices - pos_y
+
+        # Only pixels inside the cloud disc are ever drawn; the planet disc lies within it
+        disc = x**2 + y**2 <= max(radius, cloud_radius)**2
+        x, y = x[disc], y[disc]
+        self.planet = x**2 + y**2 <= radius**2
+        self.clouds = x**2 + y**2 <= cloud_radius**2
+        # Flat index into the render buffer, which is already turned 90 degrees for display
+        self.index = y_indices[disc] * width + (width - 1 - x_indices[disc])
+
+        # Normalize coordinates
+        nx = x / radius
+        ny = y / radius
+        with np.errstate(invalid='ignore', divide='ignore'):
+            nz = np.sqrt(1 - nx**2 - ny**2)
+        nz = np.nan_to_num(nz)
+        normals = np.stack((nx, ny, nz), axis=-1)
+
+        # Rotate normals around the Y-axis by -90 degrees to change the viewpoint
+        cos_tilt = math.cos(-np.pi / 2)
+        sin_tilt = math.sin(-np.pi / 2)
+        tilt_matrix = np.array([
+            [cos_tilt, 0, sin_tilt],
+            [0,        1,      0  ],
+            [-sin_tilt,0, cos_tilt]
+        ])
+        tx, ty, tz = (normals @ tilt_matrix.T).T
+
+        # Brightness after rotating by angle a about Z is cos(a) * light_cos + sin(a) * light_sin + light_z
+        self.light_cos = LIGHT_SOURCE[0] * tx + LIGHT_SOURCE[1] * ty
+        self.light_sin = LIGHT_SOURCE[1] * tx - LIGHT_SOURCE[0] * ty
+        self.light_z = LIGHT_SOURCE[2] * tz
+
+        # Latitude row in the noise maps
+        with np.errstate(invalid='ignore'):
+            theta = np.arccos(tz)  # Range [0, π]
+        theta = np.nan_to_num(theta)
+        self.noise_row = np.clip((theta / np.pi * (noise_size - 1)).astype(int), 0, noise_size - 1) * noise_size
+
+        # Longitude at zero rotation, normalized to [0, 1]
+        phi = np.arctan2(ty, tx)  # Range [-π, π]
+        self.longitude = (phi + np.pi) / (2 * np.pi)
+
+    @classmethod
+    def get(cls, width, height, pos_x, pos_y, radius, cloud_radius):
+        key = (width, height, pos_x, pos_y, radius, cloud_radius)
+        if key not in cls._cache:
+            cls._cache[key] = cls(width, height, pos_x, pos_y, radius, cloud_radius)
+        return cls._cache[key]
+
+# Render buffer laid out as render_surface rotated by 90 degrees, flattened to one pixel per row
+planet_pixels = np.zeros((RENDER_HEIGHT * RENDER_WIDTH, 3), dtype=np.uint8)
+rotated_render_surface = pygame.Surface((RENDER_HEIGHT, RENDER_WIDTH))
+
 def draw_planet():
     global rotation_angle, noise_offset
 
-    # Create an array representing the render surface
-    screen_array = np.zeros((RENDER_HEIGHT, RENDER_WIDTH, 3), dtype=np.uint8)
-
-    # Coordinate grid centered at the planet's position
-    y_indices, x_indices = np.indices((RENDER_HEIGHT, RENDER_WIDTH))
-    x = x_indices - PLANET_POS_X
-    y = y_indices - PLANET_POS_Y
-
-    # Planet mask
-    planet_mask = x**2 + y**2 <= PLANET_RADIUS**2
-
-    # Normalize coordinates
-    nx = x / PLANET_RADIUS
-    ny = y / PLANET_RADIUS
-    with np.errstate(invalid='ignore', divide='ignore'):
-        nz = np.sqrt(1 - nx**2 - ny**2)
-    nz = np.nan_to_num(nz)
-
-    # Stack normals
-    normals = np.stack((nx, ny, nz), axis=-1)
-
-    # Rotate normals around the Y-axis by -90 degrees to change the viewpoint
-    cos_tilt = math.cos(-np.pi / 2)
-    sin_tilt = math.sin(-np.pi / 2)
-    tilt_matrix = np.array([
-        [cos_tilt, 0, sin_tilt],
-        [0,        1,      0  ],
-        [-sin_tilt,0, cos_tilt]
-    ])
-    normals = normals @ tilt_matrix.T
-
-    # Rotation matrix around the Z-axis (polar axis)
-    cos_angle = math.cos(rotation_angle)
-    sin_angle = math.sin(rotation_angle)
-    rotation_matrix = np.array([
-        [cos_angle, -sin_angle, 0],
-        [sin_angle,  cos_angle, 0],
-        [0,          0,         1]
-    ])
-
-    # Rotate normals around the Z-axis
-    rotated_normals = normals @ rotation_matrix.T
-
-    # Compute brightness
-    brightness = np.einsum('ijk,k->ij', rotated_normals, LIGHT_SOURCE)
-    brightness = np.clip(brightness, 0, 1)
-
-    # Compute theta and phi from rotated normals
-    with np.errstate(invalid='ignore'):
-        theta = np.arccos(rotated_normals[:, :, 2])  # Range [0, π]
-        phi = np.arctan2(rotated_normals[:, :, 1], rotated_normals[:, :, 0])  # Range [-π, π]
-    theta = np.nan_to_num(theta)
-    phi = np.nan_to_num(phi)
-
-    # Normalize theta and phi to [0, 1]
-    theta_normalized = theta / np.pi
-    phi_normalized = (phi + np.pi) / (2 * np.pi)
-
-    # Map to noise texture
-    noise_x = (phi_normalized * (noise_size - 1)).astype(int)
-    noise_y = (theta_normalized * (noise_size - 1)).astype(int)
-
-    # Ensure indices are within bounds
-    noise_x = np.clip(noise_x, 0, noise_size - 1)
-    noise_y = np.clip(noise_y, 0, noise_size - 1)
-
-    # Get terrain noise values
-    terrain_noise = terrain_noise_image[noise_y, noise_x]
-
-    # Determine terrain type based on elevation
-    water_threshold = 0.4
-    mountain_threshold = 0.7
-    snow_threshold = 0.85
-
-    terrain_color = np.zeros((RENDER_HEIGHT, RENDER_WIDTH, 3))
-
-    # Water
-    water_mask = terrain_noise <= water_threshold
-    terrain_color[water_mask] = water_color
-
-    # Land
-    land_mask = (terrain_noise > water_threshold) & (terrain_noise <= mountain_threshold)
-    terrain_color[land_mask] = land_color
-
-    # Mountains
-    mountain_mask = (terrain_noise > mountain_threshold) & (terrain_noise <= snow_threshold)
-    terrain_color[mountain_mask] = mountain_color
-
-    # Snow
-    snow_mask = terrain_noise > snow_threshold
-    terrain_color[snow_mask] = snow_color
-
-    # Apply lighting
-    terrain_color = np.clip(terrain_color * brightness[..., None], 0, 255)
+    geometry = PlanetGeometry.get(RENDER_WIDTH, RENDER_HEIGHT, PLANET_POS_X, PLANET_POS_Y, PLANET_RADIUS, CLOUD_RADIUS)
+
+    # Compute brightness for this rotation
+    brightness = (math.cos(rotation_angle) * geometry.light_cos
+                  + math.sin(rotation_angle) * geometry.light_sin
+                  + geometry.light_z)
+    np.clip(brightness, 0, 1, out=brightness)
+
+    # Rotating about the polar axis just shifts longitude
+    longitude = (geometry.longitude + rotation_angle / (2 * np.pi)) % 1.0
+    noise_x = (longitude * (noise_size - 1)).astype(int)
+    texel = geometry.noise_row + noise_x
+
+    # Terrain colors with lighting
+    terrain_color = terrain_palette[terrain_type_image[texel]]
+    terrain_color *= brightness[:, None]
 
     # Add city lights on the dark side
-    dark_side = brightness < 0.2
-    city_noise = city_noise_image[noise_y, noise_x]
-    city_lights_mask = (city_noise > 0.8) & planet_mask & dark_side
+    city_lights_mask = city_lights_image[texel] & (brightness < 0.2)
     terrain_color[city_lights_mask] = city_light_color
 
-    # Apply planet mask
-    screen_array[planet_mask] = terrain_color[planet_mask].astype(np.uint8)
-
-    # Clouds
-    # Shift clouds noise image to simulate movement
-    clouds_noise_shifted = np.roll(clouds_noise_image_base, int(noise_offset), axis=1)
+    # Only the planet disc gets terrain
+    terrain_color[~geometry.planet] = 0
+    colors = terrain_color.astype(np.uint8)
 
-    # Get clouds noise values
-    clouds_noise = clouds_noise_shifted[noise_y, noise_x]
+    # Clouds, shifted by whole texels to simulate movement
+    clouds_noise = clouds_noise_image_base[geometry.noise_row // noise_size, (noise_x - int(noise_offset)) % noise_size]
 
     # Adjust cloud threshold to reduce clouds
     cloud_threshold = 0.7  # Increase this value to reduce clouds
-    clouds_mask = (clouds_noise > cloud_threshold) & (x**2 + y**2 <= CLOUD_RADIUS**2)
+    clouds_mask = (clouds_noise > cloud_threshold) & geometry.clouds
 
     # Calculate cloud brightness
-    cloud_brightness = brightness * (0.7 + 0.3 * clouds_noise)
-
-    # Apply clouds to the screen array
-    screen_array[clouds_mask] = np.clip(cloud_color * cloud_brightness[clouds_mask, None], 0, 255).astype(np.uint8)
-
-    # Convert the array to a surface
-    # Swap axes to match Pygame's (width, height) format
-    surface_from_array = pygame.surfarray.make_surface(screen_array.swapaxes(0, 1))
+    cloud_brightness = brightness[clouds_mask] * (0.7 + 0.3 * clouds_noise[clouds_mask])
+    colors[clouds_mask] = np.clip(cloud_color * cloud_brightness[:, None], 0, 255).astype(np.uint8)
 
-    # Blit the surface onto the render_surface
-    render_surface.blit(surface_from_array, (0, 0))
+    # Write the drawn pixels straight into the rotated surface
+    planet_pixels[geometry.index] = colors
+    pygame.surfarray.blit_array(rotated_render_surface, planet_pixels.reshape(RENDER_HEIGHT, RENDER_WIDTH, 3))
 
     # Update rotation angle and noise offset
     rotation_angle += 0.01  # Adjust rotation speed as needed
     noise_offset += 0.5     # Adjust cloud movement speed as needed
 
 def main():
+    # The render surface is already rotated by 90 degrees, so only the fit to the screen is left
+    rotated_width, rotated_height = rotated_render_surface.get_size()
+    scale_factor = min(screen_width / rotated_width, screen_height / rotated_height)
+    scaled_width = int(rotated_width * scale_factor)
+    scaled_height = int(rotated_height * scale_factor)
+    scaled_surface = pygame.Surface((scaled_width, scaled_height))
+
+    # Calculate position to center the image
+    x_offset = (screen_width - scaled_width) // 2
+    y_offset = (screen_height - scaled_height) // 2
+
     running = True
     while running:
         CLOCK.tick(30)  # Limit to 30 FPS
@@ -222,27 +219,8 @@ def main():
 
         draw_planet()
 
-        # Rotate the render_surface by 90 degrees
-        rotated_render_surface = pygame.transform.rotate(render_surface, 90)
-
-        # After rotation, the dimensions are swapped
-        rotated_width, rotated_height = rotated_render_surface.get_size()
-
-        # Calculate scale factors to maintain aspect ratio
-        scale_x = screen_width / rotated_width
-        scale_y = screen_height / rotated_height
-        scale_factor = min(scale_x, scale_y)
-
-        # Calculate new dimensions
-        scaled_width = int(rotated_width * scale_factor)
-        scaled_height = int(rotated_height * scale_factor)
-
-        # Scale the rotated render surface to the new dimensions
-        scaled_surface = pygame.transform.scale(rotated_render_surface, (scaled_width, scaled_height))
-
-        # Calculate position to center the image
-        x_offset = (screen_width - scaled_width) // 2
-        y_offset = (screen_height - scaled_height) // 2
+        # Scale the rotated render surface to fit the screen
+        scaled_surface = pygame.transform.scale(rotated_render_surface, (scaled_width, scaled_height), scaled_surface)
 
         # Fill the screen with black before blitting (in case of borders)
         SCREEN.fill((0, 0, 0))
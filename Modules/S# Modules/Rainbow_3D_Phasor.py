@@ -1,8 +1,8 @@
 import pygame
 import math
 import numpy as np
+import sounddevice as sd
 from pygame.math import Vector3
-import pygame.sndarray
 
 # Initialize Pygame
 pygame.init()
@@ -154,17 +154,49 @@ def draw_phasor(display_phase):
         text_surface = font.render(f"Enter {input_mode}: {input_value}", True, text_color)
         screen.blit(text_surface, (10, 220))
 
-def generate_sine_wave(freq, duration=0.1, volume=1.0):
-    sample_rate = 44100
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-    wave = np.sin(2 * np.pi * freq * t) * volume
-    return (wave * 32767).astype(np.int16)
-# Update the current phase display to show the offset phase
+class StreamingOscillator:
+    """
+    Sine oscillator that fills a sounddevice output callback. Phase carries over from one
+    block to the next and amplitude changes ramp across a block, so the sound has no
+    clicks and does not depend on the frame rate. Set frequency, amplitude and paused
+    from the render loop at any time.
+    """
 
-# Create sound object
-sample_rate = 44100
-buffer = np.zeros((int(sample_rate * 0.1), 2), dtype=np.int16)
-sound = pygame.sndarray.make_sound(buffer)
+    def __init__(self, frequency, amplitude, sample_rate=44100, block_size=512, channels=2):
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.paused = False
+        self.sample_rate = sample_rate
+        self.phase = 0.0  # Radians at the start of the next block
+        self.gain = 0.0   # Amplitude reached at the end of the last block
+        self.stream = sd.OutputStream(samplerate=sample_rate, blocksize=block_size, channels=channels,
+                                      dtype='float32', callback=self._callback)
+
+    def start(self):
+        self.stream.start()
+
+    def close(self):
+        self.stream.stop()
+        self.stream.close()
+
+    def render(self, frames):
+        """Return the next frames samples as a mono float array and advance the oscillator."""
+        steps = np.arange(1, frames + 1)
+        increment = 2 * np.pi * self.frequency / self.sample_rate
+        phases = self.phase + increment * steps
+        # Pausing fades to silence instead of cutting off mid-cycle
+        target = 0.0 if self.paused else self.amplitude
+        gains = self.gain + (target - self.gain) * steps / frames
+        self.phase = phases[-1] % (2 * np.pi)
+        self.gain = target
+        return np.sin(phases) * gains
+
+    def _callback(self, outdata, frames, time, status):
+        outdata[:] = self.render(frames)[:, None]
+
+# Audio runs on its own stream, independent of the frame rate
+oscillator = StreamingOscillator(frequency, amplitude)
+oscillator.start()
 
 # Main game loop
 running = True
@@ -236,16 +268,13 @@ while running:
 
     draw_phasor(display_phase)
 
-    # Update and play sound
-    if not paused:
-        new_buffer = generate_sine_wave(frequency, 0.1, amplitude)
-        stereo_buffer = np.column_stack((new_buffer, new_buffer))
-        pygame.sndarray.samples(sound)[:] = stereo_buffer
-        sound.play()
-    else:
-        sound.stop()
+    # Update the sound, which the oscillator picks up on its next block
+    oscillator.frequency = frequency
+    oscillator.amplitude = amplitude
+    oscillator.paused = paused
 
     pygame.display.flip()
     clock.tick(4.1415926535897932384626433832795)
 
+oscillator.close()
 pygame.quit()
@@ -1,5 +1,8 @@
 import random
 import string
+import queue
+import threading
+from collections import deque
 import torch
 import tkinter as tk
 from transformers import GPT2LMHeadModel, GPT2Tokenizer
@@ -26,11 +29,74 @@ def generate_adventure_message():
     # Encode the input prompt
     inputs = tokenizer.encode(prompt, return_tensors="pt").to(device)
     # Generate text
-    outputs = model.generate(inputs, max_length=50, num_return_sequences=1, no_repeat_ngram_size=2, early_stopping=True)
+    with torch.no_grad():
+        outputs = model.generate(inputs, max_length=50, num_return_sequences=1, no_repeat_ngram_size=2, early_stopping=True)
     # Decode the output
     text = tokenizer.decode(outputs[0], skip_special_tokens=True)
     return text
 
+class AdventureWorker:
+    """
+    Runs generate_adventure_message on one background thread so Tk never blocks on the model.
+    Finished messages are handed back on the Tk thread by polling with after(), and up to
+    prefetch messages are generated ahead so the next adventure is usually ready immediately.
+    """
+
+    def __init__(self, root, prefetch=1, poll_ms=50):
+        self.root = root
+        self.prefetch = prefetch
+        self.poll_ms = poll_ms
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        # Only touched on the Tk thread
+        self.ready = deque()
+        self.waiting = deque()
+        self.in_flight = 0
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self._fill()
+        self.root.after(self.poll_ms, self._poll)
+
+    def request(self, callback):
+        """Call callback(message) on the Tk thread, right away if a message was pre-generated."""
+        if self.ready:
+            callback(self.ready.popleft())
+        else:
+            self.waiting.append(callback)
+        self._fill()
+
+    def close(self):
+        self.requests.put(None)
+
+    def _fill(self):
+        # Keep one request in flight per waiting callback, plus the ones being generated ahead
+        while len(self.ready) + self.in_flight < len(self.waiting) + self.prefetch:
+            self.requests.put(True)
+            self.in_flight += 1
+
+    def _run(self):
+        while self.requests.get() is not None:
+            try:
+                message = generate_adventure_message()
+            except Exception as e:
+                message = f"The adventure could not be generated: {e}"
+            self.results.put(message)
+
+    def _poll(self):
+        while True:
+            try:
+                message = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.in_flight -= 1
+            if self.waiting:
+                self.waiting.popleft()(message)
+            else:
+                self.ready.append(message)
+        self._fill()
+        self.root.after(self.poll_ms, self._poll)
+
 def generate_random_coordinates():
     x = random.randint(0, WORLD_WIDTH)
     y = random.randint(0, WORLD_HEIGHT)
@@ -63,12 +129,15 @@ def get_random_ascii_art():
 
 def start_adventure():
     x, y, z = generate_random_coordinates()
-    adventure = generate_adventure_message()
     ascii_art = get_random_ascii_art()
 
-    adventure_message = f"\nYour random coordinates are: ({x}, {y}, {z})\nAdventure: {adventure}\n{ascii_art}\n"
-    adventure_text.insert(tk.END, adventure_message)
-    adventure_text.see(tk.END)
+    def show_adventure(adventure):
+        adventure_message = f"\nYour random coordinates are: ({x}, {y}, {z})\nAdventure: {adventure}\n{ascii_art}\n"
+        adventure_text.insert(tk.END, adventure_message)
+        adventure_text.see(tk.END)
+
+    # The message arrives from the worker, straight away if it was generated ahead
+    adventure_worker.request(show_adventure)
 
 def on_start_adventure():
     start_adventure()
@@ -78,6 +147,9 @@ root = tk.Tk()
 root.title("Virtual Randonauting Adventure")
 root.geometry("600x600")
 
+# Generate adventures off the Tk thread, one ahead of the user
+adventure_worker = AdventureWorker(root, prefetch=1)
+
 # Create a text widget to display the adventure messages
 adventure_text = tk.Text(root, wrap=tk.WORD, height=30, width=70)
 adventure_text.pack(pady=20)
@@ -92,3 +164,4 @@ quit_button.pack(pady=10)
 
 # Start the tkinter event loop
 root.mainloop()
+adventure_worker.close()
@@ -1,6 +1,7 @@
 import pygame
 import numpy as np
 import pyaudio
+import time
 
 # Initialize Pygame
 pygame.init()
@@ -24,12 +25,54 @@ stream = p.open(format=FORMAT,
                 input=True,
                 frames_per_buffer=CHUNK)
 
+class WaveformRenderer:
+    """Keeps one (CHUNK, 2) point array and redraws it with a single pygame.draw.lines call."""
+
+    def __init__(self, chunk, width, height, color=(255, 255, 255)):
+        self.color = color
+        # Same mapping as np.interp over (-32768, 32767) -> (0, height), as a multiply-add
+        self.y_scale = height / 65535
+        self.points = np.empty((chunk, 2))
+        self.points[:, 0] = np.arange(chunk) * (width / (chunk * 0.5))
+
+    def draw(self, surface, samples):
+        np.multiply(samples + 32768.0, self.y_scale, out=self.points[:, 1])
+        pygame.draw.lines(surface, self.color, False, self.points)
+
+class FrameTimer:
+    """Rolling average of frame times, reported in the window caption a couple of times a second."""
+
+    def __init__(self, window_size=60, interval=0.5):
+        self.frame_times = np.zeros(window_size)
+        self.count = 0
+        self.interval = interval
+        self.last_frame = time.perf_counter()
+        self.last_report = self.last_frame
+
+    def tick(self, chunks_read, chunks_behind):
+        now = time.perf_counter()
+        self.frame_times[self.count % len(self.frame_times)] = now - self.last_frame
+        self.count += 1
+        self.last_frame = now
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            frame_ms = self.frame_times[:min(self.count, len(self.frame_times))].mean() * 1000
+            pygame.display.set_caption(f"Live Audio Waveform - {frame_ms:.1f} ms/frame "
+                                       f"({1000 / frame_ms:.0f} fps), chunks {chunks_read}, behind {chunks_behind}")
+
 # Function to get audio data
 def get_audio_data():
-    data = stream.read(CHUNK, exception_on_overflow=False)
+    """Drain every chunk waiting in the input buffer and return the newest one plus the number read."""
+    chunks = max(1, stream.get_read_available() // CHUNK)
+    data = stream.read(CHUNK * chunks, exception_on_overflow=False)
     numpy_data = np.frombuffer(data, dtype=np.int16)
-    normalized_data = np.interp(numpy_data, (-32768, 32767), (0, WINDOW_HEIGHT))
-    return normalized_data
+    return numpy_data[-CHUNK:], chunks
+
+renderer = WaveformRenderer(CHUNK, WINDOW_WIDTH, WINDOW_HEIGHT)
+frame_timer = FrameTimer()
+chunks_read = 0
+chunks_behind = 0
+samples = np.zeros(CHUNK, dtype=np.int16)
 
 # Main loop
 running = True
@@ -38,23 +81,20 @@ while running:
         if event.type == pygame.QUIT:
             running = False
 
-    # Get the normalized audio data
-    normalized_data = get_audio_data()
+    # Get the latest audio data; more than one chunk waiting means the frame loop fell behind the input
+    samples, chunks = get_audio_data()
+    chunks_read += chunks
+    chunks_behind += chunks - 1
 
     # Clear the window
     window.fill((0, 0, 0))
 
-    # Calculate the scaling factor
-    scaling_factor = WINDOW_WIDTH / (CHUNK * 0.5)
-
     # Draw the waveform
-    for i in range(len(normalized_data) - 1):
-        x1 = i * scaling_factor
-        x2 = (i + 1) * scaling_factor
-        pygame.draw.line(window, (255, 255, 255), (x1, normalized_data[i]), (x2, normalized_data[i + 1]))
+    renderer.draw(window, samples)
 
     # Update the display
     pygame.display.flip()
+    frame_timer.tick(chunks_read, chunks_behind)
 
 # Clean up
 stream.stop_stream()
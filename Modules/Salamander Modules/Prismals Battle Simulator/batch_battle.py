@@ -0,0 +1,116 @@
+# batch_battle.py
+import numpy as np
+from simulator import load_data
+
+def build_damage_table(attackers, defenders):
+    # Each attacker uses the same move the Battle AI would pick (highest base damage),
+    # so damage only depends on the (attacker, defender) pairing and can be computed once
+    damage = np.zeros((len(attackers), len(defenders)), dtype=np.int64)
+    hit_chance = np.zeros(len(attackers))
+    for i, attacker in enumerate(attackers):
+        if not attacker.moves:
+            continue
+        move = max(attacker.moves, key=lambda move: move.damage)
+        hit_chance[i] = move.accuracy / 100
+        for j, defender in enumerate(defenders):
+            damage[i, j] = defender.calculate_damage(move, attacker)[0]
+    return damage, hit_chance
+
+def simulate_battles(team1, team2, n_battles=10000, seed=None, max_turns=1000, use_accuracy=False):
+    """
+    Runs n_battles AI-vs-AI battles side by side without any console I/O.
+
+    Turns follow execute_turn: the faster active Prismal attacks first (ties are
+    a coin flip) and the slower one only strikes back if it survived. Every attack
+    hits, as in the game; use_accuracy=True rolls each move's accuracy instead. A
+    fainted Prismal is replaced by the next one in team order instead of asking
+    for input. A side with no Prismals loses without a turn being played.
+    """
+    rng = np.random.default_rng(seed)
+
+    if not team1 or not team2:
+        winner = np.full(n_battles, 2 if team2 else 1 if team1 else 0, dtype=np.int8)
+        return summarize_battles(winner, np.zeros(n_battles, dtype=np.int64))
+
+    damage12, hit_chance1 = build_damage_table(team1, team2)
+    damage21, hit_chance2 = build_damage_table(team2, team1)
+    speed1 = np.array([p.speed for p in team1])
+    speed2 = np.array([p.speed for p in team2])
+
+    hp1 = np.tile(np.array([p.max_hp for p in team1], dtype=np.int64), (n_battles, 1))
+    hp2 = np.tile(np.array([p.max_hp for p in team2], dtype=np.int64), (n_battles, 1))
+    active1 = np.zeros(n_battles, dtype=np.int64)
+    active2 = np.zeros(n_battles, dtype=np.int64)
+    turns = np.zeros(n_battles, dtype=np.int64)
+    winner = np.zeros(n_battles, dtype=np.int8)
+    running = np.arange(n_battles)
+
+    for turn in range(1, max_turns + 1):
+        if not running.size:
+            break
+        a1 = active1[running]
+        a2 = active2[running]
+
+        s1, s2 = speed1[a1], speed2[a2]
+        team1_first = (s1 > s2) | ((s1 == s2) & (rng.random(running.size) < 0.5))
+        dealt1 = damage12[a1, a2]
+        dealt2 = damage21[a2, a1]
+        if use_accuracy:
+            dealt1 = np.where(rng.random(running.size) < hit_chance1[a1], dealt1, 0)
+            dealt2 = np.where(rng.random(running.size) < hit_chance2[a2], dealt2, 0)
+
+        h1 = hp1[running, a1]
+        h2 = hp2[running, a2]
+        # Team 1 first: team 2 takes the hit and only replies if still standing
+        h2_after_first = np.maximum(h2 - dealt1, 0)
+        h1_after_reply = np.where(h2_after_first > 0, np.maximum(h1 - dealt2, 0), h1)
+        # Team 2 first: the mirror image
+        h1_after_first = np.maximum(h1 - dealt2, 0)
+        h2_after_reply = np.where(h1_after_first > 0, np.maximum(h2 - dealt1, 0), h2)
+
+        hp1[running, a1] = np.where(team1_first, h1_after_reply, h1_after_first)
+        hp2[running, a2] = np.where(team1_first, h2_after_first, h2_after_reply)
+        turns[running] = turn
+
+        # Earlier slots are always fainted, so the first Prismal still alive is the active one
+        alive1 = hp1[running] > 0
+        alive2 = hp2[running] > 0
+        active1[running] = alive1.argmax(axis=1)
+        active2[running] = alive2.argmax(axis=1)
+
+        left1 = alive1.any(axis=1)
+        left2 = alive2.any(axis=1)
+        winner[running[left1 & ~left2]] = 1
+        winner[running[left2 & ~left1]] = 2
+        running = running[left1 & left2]
+
+    return summarize_battles(winner, turns)
+
+def summarize_battles(winner, turns):
+    n_battles = len(winner)
+    finished = winner != 0
+    return {
+        'battles': n_battles,
+        'team1_wins': int(np.sum(winner == 1)),
+        'team2_wins': int(np.sum(winner == 2)),
+        'unfinished': int(np.sum(~finished)),
+        'team1_win_rate': float(np.mean(winner == 1)) if n_battles else 0.0,
+        'team2_win_rate': float(np.mean(winner == 2)) if n_battles else 0.0,
+        'mean_turns': float(np.mean(turns[finished])) if finished.any() else 0.0,
+        'min_turns': int(np.min(turns[finished])) if finished.any() else 0,
+        'max_turns': int(np.max(turns[finished])) if finished.any() else 0,
+    }
+
+def run_batch(n_battles=10000, seed=None, max_turns=1000, use_accuracy=False):
+    team1, team2 = load_data()
+    return simulate_battles(team1, team2, n_battles, seed, max_turns, use_accuracy)
+
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    stats = run_batch(n_battles=100000, seed=0)
+    elapsed = time.perf_counter() - start
+    for key, value in stats.items():
+        print(f"{key}: {value}")
+    print(f"{stats['battles'] / elapsed:.0f} battles/s")
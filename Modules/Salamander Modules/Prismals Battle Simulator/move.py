@@ -1,5 +1,5 @@
 # move.py
-from type_effectiveness import get_effectiveness, get_move_type
+from type_effectiveness import type_effectiveness
 
 class Move:
     def __init__(self, name, damage, accuracy, is_special):
@@ -9,8 +9,8 @@ class Move:
         self._is_special = is_special
 
     def calculate_damage(self, attacker_type, defender_type):
-        move_type = get_move_type(self.name)
-        effectiveness = get_effectiveness(move_type, defender_type)
+        move_type = type_effectiveness.lookup_move_type(self.name)
+        effectiveness = type_effectiveness.lookup_effectiveness(move_type, defender_type)
         return self.damage * effectiveness
 
     def is_special(self):
@@ -19,23 +19,14 @@ class Prismal:
     def add_move(self, move):
         self.moves.append(move)
 
-    def take_damage(self, move, attacker):
-        if not isinstance(move, Move):
-            print(f"Error: Expected a Move object but got {type(move)}")
-            return
-
-        move_type = type_effectiveness.get_move_type(move.name)
+    def calculate_damage(self, move, attacker):
+        move_type = type_effectiveness.lookup_move_type(move.name)
         
         # Calculate effectiveness for multiple types
-        effectiveness_multiplier = 1
-        for defender_type in self.types:
-            effectiveness_multiplier *= type_effectiveness.get_effectiveness(move_type, defender_type)
-        
-        # Determine if the move is physical or special
-        is_special = move.is_special()
+        effectiveness_multiplier = type_effectiveness.lookup_effectiveness(move_type, self.types)
         
         # Calculate stat multiplier based on move type
-        if is_special:
+        if move.is_special():
             stat_multiplier = attacker.special_attack / self.special_defense
         else:
             stat_multiplier = attacker.attack / self.defense
@@ -52,6 +43,16 @@ class Prismal:
         
         damage = max(1, int(damage))  # Ensure at least 1 damage is dealt
         
+        return damage, stab_multiplier, effectiveness_multiplier, stat_multiplier
+
+    def take_damage(self, move, attacker):
+        if not isinstance(move, Move):
+            print(f"Error: Expected a Move object but got {type(move)}")
+            return
+
+        damage, stab_multiplier, effectiveness_multiplier, stat_multiplier = self.calculate_damage(move, attacker)
+        is_special = move.is_special()
+        
         self.hp -= damage
         self.hp = max(0, self.hp)  # Ensure HP doesn't go below 0
 
@@ -1,5 +1,6 @@
 # type_effectiveness.py
 import json
+import numpy as np
 
 class TypeEffectiveness:
     def __init__(self, type_file, move_file):
@@ -7,6 +8,33 @@ class TypeEffectiveness:
             self.type_data = json.load(f)
         with open(move_file, 'r') as f:
             self.move_data = json.load(f)
+        self.compile()
+
+    def compile(self):
+        # Integer index over every type mentioned by the type chart or a move
+        types = []
+        for defender_type, relations in self.type_data.items():
+            types.append(defender_type)
+            types.extend(relations.get("weaknesses", []))
+            types.extend(relations.get("resistances", []))
+        types.extend(move['type'] for move in self.move_data)
+        self.types = list(dict.fromkeys(types))
+        self.type_index = {type_name: i for i, type_name in enumerate(self.types)}
+
+        # effectiveness_matrix[move type, defender type], same rules as get_effectiveness
+        self.effectiveness_matrix = np.ones((len(self.types), len(self.types)))
+        for defender_type, relations in self.type_data.items():
+            column = self.type_index[defender_type]
+            for move_type in relations.get("resistances", []):
+                self.effectiveness_matrix[self.type_index[move_type], column] = 0.5
+            for move_type in relations.get("weaknesses", []):
+                self.effectiveness_matrix[self.type_index[move_type], column] = 2.0
+        np.fill_diagonal(self.effectiveness_matrix, 1.0)
+
+        # First entry wins, matching the linear scan in get_move_type
+        self.move_types = {}
+        for move in self.move_data:
+            self.move_types.setdefault(move['name'], move['type'])
 
     def get_effectiveness(self, move_type, defender_types):
         print(f"Move Type: {move_type}, Defender Types: {defender_types}")
@@ -35,6 +63,30 @@ class TypeEffectiveness:
                 return move['type']
         return None
 
+    def lookup_effectiveness(self, move_type, defender_types):
+        # Silent O(1) equivalent of get_effectiveness
+        if isinstance(defender_types, str):
+            defender_types = [defender_types]
+        row = self.type_index.get(move_type)
+        if row is None:
+            return 1.0
+        total_effectiveness = 1.0
+        for defender_type in defender_types:
+            column = self.type_index.get(defender_type)
+            if column is not None:
+                total_effectiveness *= self.effectiveness_matrix[row, column]
+        return float(total_effectiveness)
+
+    def lookup_move_type(self, move_name):
+        return self.move_types.get(move_name)
+
+    def type_ids(self, type_names):
+        return np.array([self.type_index[type_name] for type_name in type_names], dtype=np.int64)
+
+    def effectiveness_for_ids(self, move_type_ids, defender_type_ids):
+        # Vectorized over many attacks: pass equal-length (or broadcastable) arrays of type ids
+        return self.effectiveness_matrix[move_type_ids, defender_type_ids]
+
 type_effectiveness = TypeEffectiveness('data/type_relationships.json', 'data/moves.json')
 
 # For backwards compatibility
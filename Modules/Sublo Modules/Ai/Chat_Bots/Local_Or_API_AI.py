@@ -6,6 +6,7 @@ from tkinter import simpledialog, scrolledtext, ttk
 import pyttsx3
 import random
 import math
+import heapq
 
 # Define the hex_to_rgb function
 def hex_to_rgb(hex_color):
@@ -24,6 +25,67 @@ class Character:
         self.greeting = greeting
         self.definition = definition
 
+class NgramIndex:
+    """Next-word counts per word window, with Shannon entropy kept up to date as text is added."""
+
+    def __init__(self, window_size=2):
+        self.window_size = window_size
+        self.counts = {}      # word pair -> {next word: count}
+        self.totals = {}      # word pair -> total count
+        self.plogp = {}       # word pair -> sum of count * log2(count)
+        self.entropy = {}     # word pair -> current Shannon entropy
+        self.order = {}       # word pair -> first-seen position, breaks entropy ties
+        self.heap = []        # lazy max-heap of (-entropy, order, word pair)
+
+    def add_tokens(self, tokens):
+        """Count only the windows in the new tokens and refresh the entropy of the pairs they touch."""
+        touched = set()
+        for i in range(len(tokens) - self.window_size):
+            word_pair = tuple(tokens[i:i+self.window_size])
+            if '' in word_pair:
+                continue
+            next_word = tokens[i+self.window_size]
+            next_words = self.counts.setdefault(word_pair, {})
+            count = next_words.get(next_word, 0)
+            next_words[next_word] = count + 1
+            self.totals[word_pair] = self.totals.get(word_pair, 0) + 1
+            # H = log2(T) - sum(c * log2(c)) / T, so only the changed count needs updating
+            self.plogp[word_pair] = (self.plogp.get(word_pair, 0.0) + (count + 1) * math.log2(count + 1)
+                                     - (count * math.log2(count) if count else 0.0))
+            self.order.setdefault(word_pair, len(self.order))
+            touched.add(word_pair)
+
+        for word_pair in touched:
+            total = self.totals[word_pair]
+            self.entropy[word_pair] = max(0.0, math.log2(total) - self.plogp[word_pair] / total)
+            heapq.heappush(self.heap, (-self.entropy[word_pair], self.order[word_pair], word_pair))
+
+        # Drop stale heap entries once they outnumber the live ones
+        if len(self.heap) > 2 * len(self.entropy):
+            self.heap = [(-entropy, self.order[word_pair], word_pair) for word_pair, entropy in self.entropy.items()]
+            heapq.heapify(self.heap)
+
+    def top_k(self, k):
+        """Return the k word pairs with the highest entropy, popping past stale entries."""
+        found = []
+        seen = set()
+        while self.heap and len(found) < k:
+            entry = heapq.heappop(self.heap)
+            neg_entropy, order, word_pair = entry
+            if word_pair in seen or -neg_entropy != self.entropy[word_pair]:
+                continue
+            seen.add(word_pair)
+            found.append(entry)
+        for entry in found:
+            heapq.heappush(self.heap, entry)
+        return [word_pair for neg_entropy, order, word_pair in found]
+
+    def sample_next(self, word_pair):
+        next_words = self.counts.get(word_pair)
+        if not next_words:
+            return None
+        return random.choices(list(next_words), weights=list(next_words.values()))[0]
+
 def generate_response(prompt):
     # Create a chat completion
     response = client.chat.completions.create(
@@ -292,23 +354,18 @@ class CharacterApp:
         self.send_button.pack()
 
         # Markov chain variables
-        self.ngram = {}
         self.window_size = 2
         self.corpus = r"asleep Plug half Corpus half Here half there half i dont care lol. -mira"
 
+        # Index the base corpus once; each message only adds its own windows
+        self.corpus_tokens = self.preprocess_corpus(self.corpus).split()
+        self.ngram = NgramIndex(self.window_size)
+        self.ngram.add_tokens(self.corpus_tokens)
+
     def preprocess_corpus(self, corpus):
         """Preprocess the corpus text."""
         return corpus.lower().replace('"','').replace("'",'').replace('\n','').replace(')','').replace('(','').replace('[','').replace(']','').replace('’','').replace("“",'').replace("”",'')
 
-    def shannon_entropy(self, word_counts):
-        """Calculate Shannon entropy."""
-        total_count = sum(word_counts.values())
-        entropy = 0
-        for count in word_counts.values():
-            probability = count / total_count
-            entropy -= probability * math.log2(probability)
-        return entropy
-
     def generate_markov_response(self, user_input):
         """Generate a response based on the user input and the n-gram model.
         You: hi
@@ -327,36 +384,12 @@ You: gtg bye bye :)
 Bot: asleep plug half corpus"""
         out = ''
         
-        # Combine user input and base corpus
-        combined_corpus = user_input + ' ' + self.corpus
-        
-        # Preprocess combined corpus
-        combined_corpus = self.preprocess_corpus(combined_corpus)
-        
-        # Split combined corpus into tokens
-        tokens = combined_corpus.split()
-        
-        # Populate n-gram from combined corpus
-        for i in range(len(tokens) - self.window_size):
-            word_pair = tuple(tokens[i:i+self.window_size])
-            if '' in word_pair:
-                continue
-            next_word = tokens[i+self.window_size]
-            self.ngram.setdefault(word_pair, []).append(next_word)
-        
-        # Calculate Shannon entropy for each word pair
-        entropy_scores = {}
-        for word_pair, next_words in self.ngram.items():
-            next_word_counts = {}
-            for word in next_words:
-                next_word_counts[word] = next_word_counts.get(word, 0) + 1
-            entropy_scores[word_pair] = self.shannon_entropy(next_word_counts)
-        
-        # Sort word pairs by entropy in descending order
-        sorted_word_pairs = sorted(entropy_scores, key=entropy_scores.get, reverse=True)
+        # Add the user input, plus the windows that run on into the base corpus
+        tokens = self.preprocess_corpus(user_input).split()
+        self.ngram.add_tokens(tokens + self.corpus_tokens[:self.window_size])
         
         # Get the word pairs with the highest entropy
-        high_entropy_word_pairs = sorted_word_pairs[:10]
+        high_entropy_word_pairs = self.ngram.top_k(10)
         
         # Choose a word pair from the high entropy word pairs
         chosen_word_pair = random.choice(high_entropy_word_pairs)
@@ -365,9 +398,9 @@ Bot: asleep plug half corpus"""
         out = ' '.join(chosen_word_pair)
         
         while len(out.split()) < len(user_input.split()):
-            if chosen_word_pair not in self.ngram.keys():
+            next_word = self.ngram.sample_next(chosen_word_pair)
+            if next_word is None:
                 break
-            next_word = random.choice(self.ngram[chosen_word_pair])
             out += ' ' + next_word
             chosen_word_pair = (chosen_word_pair[1], next_word)
         
@@ -1,10 +1,114 @@
 import pygame
 from moviepy.editor import VideoFileClip
 import sys
+import threading
 
 # Settings
 video_path = "your_video.mp4"  # Replace with your video file
 initial_speed = 1.0  # Playback speed multiplier
+cache_frames = 48  # Pre-scaled frames kept around the playhead
+
+
+class StreamingVideo:
+    """Decodes ahead of the playhead on a background thread into a bounded cache of pre-scaled surfaces."""
+
+    def __init__(self, path, target_size, cache_frames=48):
+        self.clip = VideoFileClip(path, audio=False)
+        self.fps = self.clip.fps
+        self.size = self.clip.size
+        self.frame_count = max(1, int(self.clip.duration * self.fps))
+        self.target_size = target_size
+        self.cache_frames = cache_frames
+        self.ahead = max(1, cache_frames // 2)
+
+        self.cache = {}  # frame index -> pre-scaled surface
+        self.position = 0
+        self.direction = 1
+        self.block = []  # reverse block being decoded, lowest index first
+        self.running = True
+        self.error = None  # Set if the decoder thread died, so waiting callers don't hang
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._decode_loop, daemon=True)
+        self.thread.start()
+
+    def set_playhead(self, position, direction):
+        with self.condition:
+            self.position = int(position) % self.frame_count
+            self.direction = direction
+            self.condition.notify()
+
+    def get_frame(self, index, wait=False):
+        # Returns None instead of blocking when the decoder hasn't caught up, unless asked to wait
+        index = int(index) % self.frame_count
+        with self.condition:
+            while wait and index not in self.cache and self.running:
+                self.condition.wait()
+            if self.error is not None and index not in self.cache:
+                raise RuntimeError(f"Video decoding stopped: {self.error}") from self.error
+            return self.cache.get(index)
+
+    def close(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join()
+        self.clip.close()
+
+    def _window(self):
+        if self.direction > 0:
+            self.block = []
+            indices = [(self.position + i) % self.frame_count for i in range(self.ahead)]
+            return [i for i in indices if i not in self.cache]
+
+        # Any backward read makes the reader seek, so reverse play waits until half of the frames
+        # behind the playhead are used up, then decodes a whole block below them in one forward pass
+        self.block = [i for i in self.block if i not in self.cache and self._distance(i) < self.cache_frames]
+        if self.block:
+            return self.block
+        behind = 0
+        while behind < self.ahead and (self.position - behind) % self.frame_count in self.cache:
+            behind += 1
+        if behind >= max(1, self.ahead // 2):
+            return []
+        start = self.position - behind - self.ahead + 1
+        indices = [(start + i) % self.frame_count for i in range(self.ahead)]
+        self.block = [i for i in indices if i not in self.cache]
+        return self.block
+
+    def _distance(self, index):
+        # Frames just behind the playhead wrap to large distances, so they are dropped first
+        return ((index - self.position) * self.direction) % self.frame_count
+
+    def _decode(self, index):
+        # The ffmpeg reader reads sequentially when index follows the last frame and otherwise
+        # restarts with input seeking, which jumps to the nearest keyframe before decoding on
+        frame = self.clip.reader.get_frame(index / self.fps)
+        surface = pygame.image.frombuffer(frame.tobytes(), self.size, "RGB")
+        return pygame.transform.scale(surface, self.target_size)
+
+    def _decode_loop(self):
+        while True:
+            with self.condition:
+                missing = self._window()
+                while not missing and self.running:
+                    self.condition.wait()
+                    missing = self._window()
+                if not self.running:
+                    return
+                index = missing[0]
+            try:
+                surface = self._decode(index)
+            except Exception as e:
+                with self.condition:
+                    self.error = e
+                    self.running = False
+                    self.condition.notify_all()
+                return
+            with self.condition:
+                self.cache[index] = surface
+                while len(self.cache) > self.cache_frames:
+                    del self.cache[max(self.cache, key=self._distance)]
+                self.condition.notify_all()
 
 # Initialize Pygame
 pygame.init()
@@ -12,23 +116,18 @@ screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
 pygame.display.set_caption("Video Player")
 clock = pygame.time.Clock()
 
-# Load video
-clip = VideoFileClip(video_path)
-video_fps = clip.fps
-video_width, video_height = clip.size
-video_surface = pygame.Surface((video_width, video_height))
+# Open video for streaming playback
+video = StreamingVideo(video_path, screen.get_size(), cache_frames)
+video_fps = video.fps
+frame_count = video.frame_count
 
 # Variables
 speed = initial_speed
 reverse = False
 frame_index = 0
 
-# Video frames as surfaces
-frames = []
-for frame in clip.iter_frames(fps=video_fps, dtype="uint8"):
-    frames.append(pygame.image.frombuffer(frame.tobytes(), clip.size, "RGB"))
-
-frame_count = len(frames)
+# Only the first frame has to be decoded before playback starts
+current_frame = video.get_frame(0, wait=True)
 
 # Main loop
 running = True
@@ -45,19 +144,28 @@ while running:
                 speed = max(0.1, speed - 0.1)
             elif event.key == pygame.K_r:  # Toggle reverse
                 reverse = not reverse
+            elif event.key == pygame.K_RIGHT:  # Seek forward 5 seconds
+                frame_index += 5 * video_fps
+            elif event.key == pygame.K_LEFT:  # Seek back 5 seconds
+                frame_index -= 5 * video_fps
 
     # Update frame index
     frame_index += -speed if reverse else speed
     frame_index %= frame_count  # Loop video
 
-    # Display the frame
-    current_frame = frames[int(frame_index) % frame_count]
-    screen.blit(pygame.transform.scale(current_frame, screen.get_size()), (0, 0))
+    video.set_playhead(frame_index, -1 if reverse else 1)
+
+    # Display the frame, holding the previous one if the decoder is behind
+    next_frame = video.get_frame(frame_index)
+    if next_frame is not None:
+        current_frame = next_frame
+    screen.blit(current_frame, (0, 0))
     pygame.display.flip()
 
     # Cap frame rate to video FPS
     clock.tick(video_fps)
 
 # Cleanup
+video.close()
 pygame.quit()
 sys.exit()
@@ -3,7 +3,9 @@ from tkinter import filedialog, messagebox
 import cv2
 import numpy as np
 import threading
+import queue
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Define colorblindness transformation matrices
 COLORBLINDNESS_MATRICES = {
@@ -49,7 +51,68 @@ def apply_colorblind_filter(frame, matrix):
     
     return bgr_transformed
 
-def process_video(input_path, output_path, filters, progress_callback):
+def filter_frame(frame, matrices):
+    """
+    Apply each selected filter to a frame in sequence.
+    """
+    for matrix in matrices:
+        frame = apply_colorblind_filter(frame, matrix)
+    return frame
+
+def iter_frames(cap):
+    """
+    Yield frames from an opened capture until it runs out.
+    """
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        yield frame
+
+def iter_filtered_frames(cap, matrices, workers, max_in_flight=None):
+    """
+    Yield filtered frames in their original order while a reader thread keeps
+    decoding ahead and a pool of workers filters several frames at once.
+    
+    Parameters:
+        cap (cv2.VideoCapture): The opened input video.
+        matrices (list): Transformation matrices to apply in order.
+        workers (int): Number of filter worker threads.
+        max_in_flight (int): Frames read ahead of the writer; bounds memory use.
+    """
+    pending = queue.Queue(maxsize=max_in_flight or workers * 4)
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=workers)
+    
+    def read_frames():
+        try:
+            for frame in iter_frames(cap):
+                if stop.is_set():
+                    break
+                pending.put(pool.submit(filter_frame, frame, matrices))
+        finally:
+            pending.put(None)
+    
+    reader = threading.Thread(target=read_frames, daemon=True)
+    reader.start()
+    try:
+        # Futures are queued in read order, so waiting on them in turn keeps the output ordered
+        while True:
+            future = pending.get()
+            if future is None:
+                break
+            yield future.result()
+    finally:
+        stop.set()
+        # Drain the queue so a reader blocked on a full queue can exit
+        while reader.is_alive():
+            try:
+                pending.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        pool.shutdown(wait=True)
+
+def process_video(input_path, output_path, filters, progress_callback, workers=None):
     """
     Process the input video and apply the selected colorblindness filters in sequence.
     
@@ -58,6 +121,7 @@ def process_video(input_path, output_path, filters, progress_callback):
         output_path (str): Path to save the output video.
         filters (list): List of filter types to apply in order.
         progress_callback (function): Function to update the progress bar.
+        workers (int): Filter worker threads; defaults to the CPU count, 1 processes frames serially.
     """
     try:
         # Open the input video
@@ -88,17 +152,14 @@ def process_video(input_path, output_path, filters, progress_callback):
             matrices.append(matrix)
         
         # Process each frame
+        workers = workers or os.cpu_count() or 1
+        if workers > 1:
+            filtered_frames = iter_filtered_frames(cap, matrices, workers)
+        else:
+            filtered_frames = (filter_frame(frame, matrices) for frame in iter_frames(cap))
+        
         frame_num = 0
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Apply each selected filter in sequence
-            filtered_frame = frame
-            for matrix in matrices:
-                filtered_frame = apply_colorblind_filter(filtered_frame, matrix)
-            
+        for filtered_frame in filtered_frames:
             # Write the frame to the output video
             out.write(filtered_frame)
             
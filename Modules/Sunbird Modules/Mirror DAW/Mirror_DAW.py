@@ -7,7 +7,6 @@ import threading
 import sounddevice as sd
 import soundfile as sf
 import numpy as np
-from pydub import AudioSegment
 import re
 from pythonosc.udp_client import SimpleUDPClient
 
@@ -15,8 +14,10 @@ from pythonosc.udp_client import SimpleUDPClient
 TRACKS_DIR = "tracks"
 SAMPLE_RATE = 44100  # Standard CD-quality sample rate
 CHANNELS = 2         # Stereo recording
+MIX_BLOCK_SIZE = 2048  # Frames read from each track per playback callback
 OSC_ADDRESS = "127.0.0.1"  # Localhost
 OSC_PORT = 5005  # Default OSC port
+MIDA_LOOKAHEAD = 0.002  # Seconds before a deadline to stop sleeping and spin
 
 # OSC Client Setup
 osc_client = SimpleUDPClient(OSC_ADDRESS, OSC_PORT)
@@ -41,137 +42,265 @@ def record_track(track_number, duration):
     except Exception as e:
         print(f"An error occurred during recording: {e}")
 
-def play_audio_tracks(audio_tracks):
+def play_audio_tracks(audio_tracks, block_size=MIX_BLOCK_SIZE):
+    """Stream the tracks block by block into one output callback, so memory depends on block size, not song length."""
+    files = []
     try:
-        combined = None
-        for file in audio_tracks:
-            data, sr = sf.read(os.path.join(TRACKS_DIR, file))
-            if combined is None:
-                combined = data
-            else:
-                # Pad shorter arrays with zeros
-                if data.shape[0] < combined.shape[0]:
-                    data = np.pad(data, ((0, combined.shape[0] - data.shape[0]), (0, 0)), 'constant')
-                elif data.shape[0] > combined.shape[0]:
-                    combined = np.pad(combined, ((0, data.shape[0] - combined.shape[0]), (0, 0)), 'constant')
-                combined += data
-        if combined is not None:
-            sd.play(combined, SAMPLE_RATE)
-            sd.wait()
+        files = [sf.SoundFile(os.path.join(TRACKS_DIR, file)) for file in audio_tracks]
+        if not files:
+            return
+        mix = np.zeros((block_size, CHANNELS), dtype=np.float32)
+        track_buffers = [np.zeros((block_size, f.channels), dtype=np.float32) for f in files]
+        finished = threading.Event()
+
+        def callback(outdata, frames, time_info, status):
+            mix[:frames] = 0
+            longest = 0
+            for f, buffer in zip(files, track_buffers):
+                block = f.read(frames, dtype='float32', always_2d=True, out=buffer[:frames])
+                if len(block):
+                    # Mono tracks are spread across every output channel
+                    mix[:len(block)] += block[:, :CHANNELS] if block.shape[1] >= CHANNELS else block[:, :1]
+                    longest = max(longest, len(block))
+            outdata[:] = mix[:frames]
+            if longest < frames:
+                raise sd.CallbackStop
+
+        with sd.OutputStream(samplerate=SAMPLE_RATE, blocksize=block_size, channels=CHANNELS, dtype='float32',
+                             callback=callback, finished_callback=finished.set):
+            finished.wait()
     except Exception as e:
         print(f"An error occurred during audio playback: {e}")
-
-def send_osc_note_message(note, velocity=64, channel=1):
-    """Send an OSC message representing a MIDI note on/off event and return the message string."""
-    # Map note to MIDI number (e.g., "C4" to 60)
-    note_map = {
-        "C": 0, "C#": 1, "Db": 1, "D": 2, "D#": 3, "Eb": 3,
-        "E": 4, "F": 5, "F#": 6, "Gb": 6, "G": 7, "G#": 8,
-        "Ab": 8, "A": 9, "A#": 10, "Bb": 10, "B": 11
-    }
-    match = re.match(r'([A-G][#b]?)(-?\d+)', note)
-    if not match:
-        message = f"Invalid note format: {note}"
-        print(message)
-        return message
-    note_name, octave = match.groups()
-    note_number = 12 * (int(octave) + 1) + note_map[note_name]  # Calculate MIDI note number
-
-    # Send the OSC message
-    osc_client.send_message("/midi/note", [channel, note_number, velocity])
-    message = ""# f"Ch={channel},N={note_number},V={velocity}"
-    return message
-
-def play_mida_tracks(mida_tracks, bpm):
-    # Parse all Mida tracks into event lists
-    all_event_lists = []
-    for filename in mida_tracks:
-        event_list = parse_mida_file(filename)
-        all_event_lists.append(event_list)
-
-    if not all_event_lists:
-        return
-
-    sixteenth_note_duration = 60 / (bpm * 4)  # BPM to 16th note in seconds
-
-    # Determine the maximum length among all event lists
-    max_length = max(len(event_list) for event_list in all_event_lists)
-
-    # Pad shorter event lists with spaces
-    for idx, event_list in enumerate(all_event_lists):
-        if len(event_list) < max_length:
-            event_list.extend([' '] * (max_length - len(event_list)))
-        all_event_lists[idx] = event_list
-
-    # Play back the Mida tracks in sync
-    for i in range(max_length):
-        line_output = []
-        osc_messages = []
-        for event_list in all_event_lists:
-            event = event_list[i]
-            output_line = event
-            if event not in ['-', '.', ' ']:  # Only send OSC for note events
-                notes = event.split("~")  # Handle chords or simultaneous notes
-                for note in notes:
-                    osc_message = send_osc_note_message(note)
-                    output_line += f" {osc_message}"
-            line_output.append(output_line)
-        print(' '.join(line_output))
-        time.sleep(sixteenth_note_duration)
-
-def parse_mida_file(filename):
-    try:
-        with open(os.path.join(TRACKS_DIR, filename), 'r') as f:
-            mida_data = f.read()
-            event_list = parse_mida_data(mida_data)
-            return event_list
-    except Exception as e:
-        print(f"An error occurred while parsing Mida file {filename}: {e}")
-        return []  # Return empty list if error
-
-def parse_mida_data(mida_data):
-    # This function parses the Mida data and returns a list of events
-    tokens = re.findall(r'([A-G][#b]?-?\d+|\.\d*|\-\d*|~|\d+)', mida_data)
-    event_list = []
+    finally:
+        for f in files:
+            f.close()
+
+NOTE_MAP = {
+    "C": 0, "C#": 1, "Db": 1, "D": 2, "D#": 3, "Eb": 3,
+    "E": 4, "F": 5, "F#": 6, "Gb": 6, "G": 7, "G#": 8,
+    "Ab": 8, "A": 9, "A#": 10, "Bb": 10, "B": 11
+}
+MIDA_TOKEN_PATTERN = re.compile(r'([A-G][#b]?-?\d+|\.\d*|\-\d*|~|\d+)')
+MIDA_NOTE_PATTERN = re.compile(r'([A-G][#b]?)(-?\d+)')
+# Every note name in the MIDI octave range, so parsing is a dict lookup instead of a regex per note
+NOTE_NUMBERS = {f"{name}{octave}": 12 * (octave + 1) + value
+                for name, value in NOTE_MAP.items() for octave in range(-1, 10)}
+
+def note_to_midi(note):
+    """Return the MIDI note number for a note name like "C4", or None if it is not a note."""
+    number = NOTE_NUMBERS.get(note)
+    if number is None:
+        match = MIDA_NOTE_PATTERN.match(note)
+        if match and match.group(1) in NOTE_MAP:
+            note_name, octave = match.groups()
+            number = 12 * (int(octave) + 1) + NOTE_MAP[note_name]
+    return number
+
+class CompiledMida:
+    """A Mida score compiled once into parallel arrays of onset tick, duration in ticks and MIDI number."""
+
+    def __init__(self, onsets, durations, notes, names, length):
+        self.onsets = np.asarray(onsets, dtype=np.int64)
+        self.durations = np.asarray(durations, dtype=np.int64)
+        self.notes = np.asarray(notes, dtype=np.int64)
+        self.names = names
+        self.length = length  # Total ticks (16th notes), including trailing rests and sustains
+
+    def __len__(self):
+        return len(self.notes)
+
+def compile_mida(mida_data):
+    """
+    Compile Mida data straight from its tokens into a CompiledMida, without expanding
+    rests and sustains into per-step events. Every 16th note step is one tick.
+    """
+    tokens = MIDA_TOKEN_PATTERN.findall(mida_data)
+    onsets, durations, notes, names = [], [], [], []
+
+    def add_note(name, tick, length):
+        number = note_to_midi(name)
+        if number is None:
+            print(f"Invalid note format: {name}")
+            return
+        sounding.append(len(notes))
+        onsets.append(tick)
+        durations.append(length)
+        notes.append(number)
+        names.append(name)
+
+    sounding = []  # Indices of the notes a sustain would extend
+    tick = 0
     idx = 0
     while idx < len(tokens):
         token = tokens[idx]
+        idx += 1
         if token == '~':
-            # Handle simultaneous notes
-            notes = []
-            idx += 1
-            while idx < len(tokens) and re.match(r'[A-G][#b]?-?\d+', tokens[idx]):
-                notes.append(tokens[idx])
+            # Simultaneous notes share one tick
+            sounding = []
+            while idx < len(tokens) and tokens[idx][0] in NOTE_MAP:
+                add_note(tokens[idx], tick, 1)
                 idx += 1
-            event_list.append('~'.join(notes))
-        elif token.startswith('.'):
+            tick += 1
+        elif token[0] == '.':
             # Rest
-            length = int(token[1:]) if token[1:].isdigit() else 1
-            for _ in range(length):
-                event_list.append('.')
-            idx += 1
-        elif token.startswith('-'):
+            tick += int(token[1:]) if token[1:].isdigit() else 1
+            sounding = []
+        elif token[0] == '-':
             # Sustain
             length = int(token[1:]) if token[1:].isdigit() else 1
-            for _ in range(length):
-                event_list.append('-')
-            idx += 1
-        elif re.match(r'[A-G][#b]?-?\d+', token):
-            # Note
-            note = token
-            idx += 1
-            # Check if next token is a length modifier
+            for i in sounding:
+                durations[i] += length
+            tick += length
+        elif token[0] in NOTE_MAP:
+            # Note, with an optional length modifier
+            length = 1
             if idx < len(tokens) and tokens[idx].isdigit():
                 length = int(tokens[idx])
                 idx += 1
-            else:
-                length = 1
-            event_list.append(note)
-            for _ in range(length - 1):
-                event_list.append('-')
-        else:
-            idx += 1  # Skip any unrecognized tokens
-    return event_list
+            length = max(1, length)  # A zero length still takes its own step
+            sounding = []
+            add_note(token, tick, length)
+            tick += length
+    return CompiledMida(onsets, durations, notes, names, tick)
+
+def build_mida_timeline(scores, bpm):
+    """
+    Merge compiled Mida scores into (offset in seconds, note names, MIDI numbers) steps on one
+    absolute timeline. Only ticks where something starts get a step, plus an empty closing
+    step at the end of the longest score so playback waits out trailing rests and sustains.
+    """
+    sixteenth_note_duration = 60 / (bpm * 4)  # BPM to 16th note in seconds
+    length = max((score.length for score in scores), default=0)
+    scores = [score for score in scores if len(score)]
+    if not scores:
+        return [(length * sixteenth_note_duration, [], [])] if length else []
+    onsets = np.concatenate([score.onsets for score in scores])
+    notes = np.concatenate([score.notes for score in scores])
+    names = [name for score in scores for name in score.names]
+    # A stable sort keeps track order within a tick, like the per-step playback did
+    order = np.argsort(onsets, kind='stable')
+    onsets, notes = onsets[order], notes[order].tolist()
+    ticks, first = np.unique(onsets, return_index=True)
+    bounds = first.tolist() + [len(order)]
+    timeline = []
+    for step, tick in enumerate(ticks.tolist()):
+        lo, hi = bounds[step], bounds[step + 1]
+        timeline.append((tick * sixteenth_note_duration,
+                         [names[i] for i in order[lo:hi].tolist()],
+                         notes[lo:hi]))
+    timeline.append((length * sixteenth_note_duration, [], []))
+    return timeline
+
+def wait_until(deadline, lookahead=MIDA_LOOKAHEAD):
+    # Sleep coarsely, then spin the last few milliseconds so OS wake-up jitter is absorbed
+    remaining = deadline - time.perf_counter()
+    if remaining > lookahead:
+        time.sleep(remaining - lookahead)
+    while time.perf_counter() < deadline:
+        pass
+
+def dispatch_mida_timeline(timeline, lookahead=MIDA_LOOKAHEAD, client=None, verbose=True):
+    """
+    Send each step at start + offset on the monotonic clock. Deadlines never depend on
+    how long the previous step took, so OSC send cost and printing cannot accumulate drift.
+    Returns the start time the offsets are relative to.
+    """
+    start = time.perf_counter() + lookahead
+    send = (client or osc_client).send_message
+    for offset, names, notes in timeline:
+        wait_until(start + offset, lookahead)
+        for note_number in notes:
+            send("/midi/note", [1, note_number, 64])
+        if verbose and names:
+            print(' '.join(names))
+    return start
+
+def measure_mida_jitter(mida_data, bpm=120, repeats=16, port=OSC_PORT + 1, lookahead=MIDA_LOOKAHEAD):
+    """Play Mida data against a local mock OSC server and report how far arrivals land from the timeline."""
+    from pythonosc import dispatcher, osc_server
+
+    arrivals = []
+    disp = dispatcher.Dispatcher()
+    disp.map("/midi/note", lambda address, *args: arrivals.append(time.perf_counter()))
+    server = osc_server.ThreadingOSCUDPServer((OSC_ADDRESS, port), disp)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    try:
+        score = compile_mida(' '.join([mida_data] * repeats))
+        timeline = build_mida_timeline([score], bpm)
+        start = dispatch_mida_timeline(timeline, lookahead, SimpleUDPClient(OSC_ADDRESS, port), verbose=False)
+        time.sleep(0.1)  # Let the last packets arrive
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    expected = [start + offset for offset, names, notes in timeline for note in notes]
+    if not expected or len(arrivals) != len(expected):
+        print(f"Received {len(arrivals)} of {len(expected)} OSC messages; cannot measure jitter.")
+        return None
+
+    jitter = np.abs(np.array(arrivals) - np.array(expected)) * 1000
+    report = {
+        'messages': len(expected),
+        'duration_s': timeline[-1][0],
+        'max_jitter_ms': float(jitter.max()),
+        'mean_jitter_ms': float(jitter.mean()),
+        'final_drift_ms': float(arrivals[-1] - expected[-1]) * 1000,
+    }
+    print(f"{report['messages']} messages over {report['duration_s']:.1f} s: "
+          f"max jitter {report['max_jitter_ms']:.3f} ms, mean jitter {report['mean_jitter_ms']:.3f} ms, "
+          f"final drift {report['final_drift_ms']:.3f} ms")
+    return report
+
+def play_mida_tracks(mida_tracks, bpm):
+    # Compile all Mida tracks once up front
+    scores = [compile_mida_file(filename) for filename in mida_tracks]
+
+    if not scores:
+        return
+
+    # Play back the Mida tracks in sync against one absolute timeline
+    dispatch_mida_timeline(build_mida_timeline(scores, bpm))
+
+def compile_mida_file(filename):
+    try:
+        with open(os.path.join(TRACKS_DIR, filename), 'r') as f:
+            return compile_mida(f.read())
+    except Exception as e:
+        print(f"An error occurred while compiling Mida file {filename}: {e}")
+        return compile_mida("")  # Return an empty score if error
+
+def mixdown(paths, output_filename, volumes=None, block_size=MIX_BLOCK_SIZE * 32, dither=True):
+    """
+    Sum audio files into one float32 buffer with per-track gain (dB), then run a single
+    normalization and TPDF dither stage while writing 16-bit PCM in chunks.
+    """
+    length = max(sf.info(path).frames for path in paths)
+    mix = np.zeros((length, CHANNELS), dtype=np.float32)
+    for idx, path in enumerate(paths):
+        gain = 10 ** (volumes[idx] / 20) if volumes and idx < len(volumes) else 1.0
+        position = 0
+        with sf.SoundFile(path) as f:
+            for block in f.blocks(blocksize=block_size, dtype='float32', always_2d=True):
+                # Mono tracks are spread across every output channel
+                block = block[:, :CHANNELS] if block.shape[1] >= CHANNELS else block[:, :1]
+                mix[position:position + len(block)] += gain * block
+                position += len(block)
+
+    # Scale down only if the sum would clip
+    full_scale = 1.0 - 1 / 32768
+    peak = float(np.max(np.abs(mix))) if length else 0.0
+    scale = full_scale / peak if peak > full_scale else 1.0
+
+    rng = np.random.default_rng()
+    with sf.SoundFile(output_filename, 'w', SAMPLE_RATE, CHANNELS, subtype='PCM_16') as out:
+        for start in range(0, length, block_size):
+            block = mix[start:start + block_size] * scale
+            if dither:
+                # Triangular dither of +/- 1 LSB at 16 bits
+                block += ((rng.random(block.shape) - rng.random(block.shape)) / 32768).astype(np.float32)
+            out.write(np.clip(block, -1.0, full_scale))
 
 def mix_tracks(output_filename="mixed_output.wav", volumes=None):
     files = list_tracks()
@@ -181,28 +310,37 @@ def mix_tracks(output_filename="mixed_output.wav", volumes=None):
 
     print("Mixing tracks...")
     try:
-        combined = None
-        idx_audio = 0  # Index for volumes list
-        for file in files:
-            if file.endswith('.wav'):
-                track = AudioSegment.from_wav(os.path.join(TRACKS_DIR, file))
-                # Apply volume adjustment if specified
-                if volumes and idx_audio < len(volumes):
-                    track += volumes[idx_audio]  # PyDub uses dB for volume adjustment
-                    idx_audio += 1
-                if combined is None:
-                    combined = track
-                else:
-                    combined = combined.overlay(track)
-            # Mida tracks are not included in the audio mix
-        if combined:
-            combined.export(output_filename, format="wav")
+        # Mida tracks are not included in the audio mix
+        audio_paths = [os.path.join(TRACKS_DIR, file) for file in files if file.endswith('.wav')]
+        if audio_paths:
+            mixdown(audio_paths, output_filename, volumes)
             print(f"Exported mixed track as {output_filename}")
         else:
             print("No audio tracks to mix.")
     except Exception as e:
         print(f"An error occurred during mixing: {e}")
 
+def benchmark_mixdown(track_counts=(1, 2, 4, 8, 16, 32), duration=30):
+    """Time mixdown on synthetic tracks of the given duration for each track count."""
+    import tempfile
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        rng = np.random.default_rng(0)
+        paths = []
+        for idx in range(max(track_counts)):
+            path = os.path.join(tmp_dir, f"track_{idx}.wav")
+            sf.write(path, (rng.standard_normal((int(duration * SAMPLE_RATE), CHANNELS)) * 0.1).astype(np.float32), SAMPLE_RATE)
+            paths.append(path)
+
+        output_filename = os.path.join(tmp_dir, "mixed_output.wav")
+        for count in track_counts:
+            start = time.perf_counter()
+            mixdown(paths[:count], output_filename)
+            results[count] = time.perf_counter() - start
+            print(f"{count:3d} tracks x {duration} s: {results[count]:.3f} s")
+    return results
+
 def delete_tracks():
     confirm = input("Are you sure you want to delete all tracks? This cannot be undone. (yes/no): ")
     if confirm.lower() == 'yes':
@@ -241,6 +379,10 @@ def main():
     mix_parser.add_argument('--output', default='mixed_output.wav', help='Output filename')
     mix_parser.add_argument('--volumes', nargs='*', type=int, help='Volume adjustments in dB for each track')
 
+    # Mix benchmark command
+    mix_bench_parser = subparsers.add_parser('mix_bench', help='Benchmark mix time against track count')
+    mix_bench_parser.add_argument('--duration', type=int, default=30, help='Length of each synthetic track in seconds')
+
     # List command
     list_parser = subparsers.add_parser('list', help='List all recorded tracks')
 
@@ -252,6 +394,12 @@ def main():
     mida_parser.add_argument('mida_data', type=str, help='Mida data string')
     mida_parser.add_argument('--bpm', type=int, default=120, help='BPM for timing the Mida data')
 
+    # Mida jitter command
+    mida_jitter_parser = subparsers.add_parser('mida_jitter', help='Measure Mida timing jitter against a mock OSC server')
+    mida_jitter_parser.add_argument('mida_data', type=str, help='Mida data string')
+    mida_jitter_parser.add_argument('--bpm', type=int, default=120, help='BPM for timing the Mida data')
+    mida_jitter_parser.add_argument('--repeats', type=int, default=16, help='Times to repeat the data for a long sequence')
+
     # Mida record command
     mida_record_parser = subparsers.add_parser('mida_record', help='Record a new Mida track')
     mida_record_parser.add_argument('track_number', type=int, help='Track number to record')
@@ -296,6 +444,8 @@ def main():
 
     elif args.command == 'mix':
         mix_tracks(output_filename=args.output, volumes=args.volumes)
+    elif args.command == 'mix_bench':
+        benchmark_mixdown(duration=args.duration)
     elif args.command == 'list':
         tracks = list_tracks()
         if tracks:
@@ -311,18 +461,9 @@ def main():
         delete_tracks()
     elif args.command == 'mida':
         # For testing purposes, interpret Mida data directly
-        event_list = parse_mida_data(args.mida_data)
-        bpm = args.bpm
-        sixteenth_note_duration = 60 / (bpm * 4)
-        for event in event_list:
-            output_line = event
-            if event not in ['-', '.', ' ']:
-                notes = event.split("~")
-                for note in notes:
-                    osc_message = send_osc_note_message(note)
-                    output_line += f" {osc_message}"
-            print(output_line)
-            time.sleep(sixteenth_note_duration)
+        dispatch_mida_timeline(build_mida_timeline([compile_mida(args.mida_data)], args.bpm))
+    elif args.command == 'mida_jitter':
+        measure_mida_jitter(args.mida_data, bpm=args.bpm, repeats=args.repeats)
     elif args.command == 'mida_record':
         record_mida_track(args.track_number, args.mida_data)
     else:
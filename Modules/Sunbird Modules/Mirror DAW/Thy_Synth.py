@@ -1,26 +1,142 @@
 import pygame.midi
 from pythonosc import dispatcher
 from pythonosc import osc_server
+import argparse
+import heapq
+import itertools
 import threading
 import time
 
 # Constants for OSC
 OSC_ADDRESS = "127.0.0.1"  # Must match the address used in mirrordaw.py
 OSC_PORT = 5005            # Must match the port used in mirrordaw.py
+NOTE_LENGTH = 0.5          # Seconds a note sounds before its note-off
+NOTE_OFF_LOOKAHEAD = 0.002  # Seconds before a note-off to stop sleeping and spin
 
-# Initialize Pygame MIDI
-pygame.midi.init()
+class NoteOffScheduler:
+    """
+    Owns writes to a MIDI output and sends every pending note-off from one thread,
+    keeping them in a heap ordered by deadline instead of starting a timer per note.
+    """
 
-# Open a MIDI output port
-midi_out = pygame.midi.Output(0)  # 0 is usually the default MIDI output port
+    def __init__(self, output, lookahead=NOTE_OFF_LOOKAHEAD):
+        self.output = output
+        self.lookahead = lookahead
+        self.pending = []  # (deadline, sequence, note, velocity, channel)
+        self.sequence = itertools.count()  # Keeps equal deadlines in arrival order
+        self.output_lock = threading.Lock()  # OSC handlers run on their own threads
+        self.condition = threading.Condition()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def note_on(self, note, velocity, channel, duration=NOTE_LENGTH):
+        with self.output_lock:
+            self.output.note_on(note, velocity, channel)
+        return self.schedule_note_off(time.perf_counter() + duration, note, velocity, channel)
+
+    def schedule_note_off(self, deadline, note, velocity, channel):
+        with self.condition:
+            heapq.heappush(self.pending, (deadline, next(self.sequence), note, velocity, channel))
+            # Only a new earliest deadline changes how long the scheduler should wait
+            if self.pending[0][0] == deadline:
+                self.condition.notify()
+        return deadline
+
+    def close(self):
+        # Pending note-offs are sent right away so no note is left hanging
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.thread.join()
+        with self.output_lock:
+            for _, _, note, velocity, channel in sorted(self.pending):
+                self.output.note_off(note, velocity, channel)
+        self.pending = []
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running:
+                    if self.pending:
+                        remaining = self.pending[0][0] - time.perf_counter()
+                        if remaining <= self.lookahead:
+                            break
+                        self.condition.wait(remaining - self.lookahead)
+                    else:
+                        self.condition.wait()
+                if not self.running:
+                    return
+                deadline = self.pending[0][0]
+
+            # Spin the last stretch so OS wake-up jitter is absorbed, yielding the GIL each pass
+            while time.perf_counter() < deadline:
+                time.sleep(0)
+
+            with self.condition:
+                now = time.perf_counter()
+                due = []
+                while self.pending and self.pending[0][0] <= now:
+                    due.append(heapq.heappop(self.pending))
+            with self.output_lock:
+                for _, _, note, velocity, channel in due:
+                    self.output.note_off(note, velocity, channel)
+
+class MockMidiOutput:
+    """Stands in for pygame.midi.Output and records when each note-off is written."""
+
+    def __init__(self):
+        self.note_ons = 0
+        self.note_offs = []  # perf_counter timestamps
+
+    def note_on(self, note, velocity, channel=0):
+        self.note_ons += 1
+
+    def note_off(self, note, velocity, channel=0):
+        self.note_offs.append(time.perf_counter())
+
+def stress_test(notes_per_second=4000, duration=2.0, note_length=NOTE_LENGTH):
+    """Fire notes at a fixed rate into a scheduler on a mock output and report note-off timing error."""
+    output = MockMidiOutput()
+    scheduler = NoteOffScheduler(output)
+    interval = 1 / notes_per_second
+    count = int(notes_per_second * duration)
+    deadlines = []
+    start = time.perf_counter()
+    for i in range(count):
+        # Sleep rather than spin so the producer does not hold the GIL away from the scheduler
+        remaining = start + i * interval - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+        deadlines.append(scheduler.note_on(i % 128, 64, 0, note_length))
+    time.sleep(note_length + 0.1)  # Let the last note-offs go out
+    scheduler.close()
+
+    if len(output.note_offs) != count:
+        print(f"Sent {len(output.note_offs)} of {count} note-offs.")
+    # Note-offs leave in deadline order, so the n-th write belongs to the n-th deadline
+    errors = sorted((sent - deadline) * 1000 for sent, deadline in zip(output.note_offs, sorted(deadlines)))
+    report = {
+        'notes': count,
+        'threads': threading.active_count(),
+        'mean_error_ms': sum(errors) / len(errors),
+        'p99_error_ms': errors[int(len(errors) * 0.99) - 1],
+        'max_error_ms': errors[-1],
+    }
+    print(f"{report['notes']} notes at {notes_per_second}/s: "
+          f"note-off error mean {report['mean_error_ms']:.3f} ms, "
+          f"p99 {report['p99_error_ms']:.3f} ms, max {report['max_error_ms']:.3f} ms")
+    return report
+
+# Opened in main so the stress test can run without a MIDI device
+midi_out = None
+note_offs = None
 
 # Handler for incoming OSC messages
 def midi_note_handler(address, channel, note, velocity):
     print(f"Received MIDI Note - Channel: {channel}, Note: {note}, Velocity: {velocity}")
-    # Note On message
-    midi_out.note_on(note, velocity, channel)
-    # Note Off message after a delay
-    threading.Timer(0.5, midi_out.note_off, args=[note, velocity, channel]).start()
+    # Note On now, Note Off after a delay from the scheduler thread
+    note_offs.note_on(note, velocity, channel)
 
 # OSC server setup in a separate thread
 def start_osc_server():
@@ -32,6 +148,23 @@ def start_osc_server():
     server.serve_forever()
 
 def main():
+    global midi_out, note_offs
+
+    parser = argparse.ArgumentParser(description="Thy Synth")
+    parser.add_argument('--stress', type=int, metavar='NOTES_PER_SECOND',
+                        help='Measure note-off timing on a mock MIDI output instead of running the synth')
+    args = parser.parse_args()
+    if args.stress:
+        stress_test(args.stress)
+        return
+
+    # Initialize Pygame MIDI
+    pygame.midi.init()
+
+    # Open a MIDI output port
+    midi_out = pygame.midi.Output(0)  # 0 is usually the default MIDI output port
+    note_offs = NoteOffScheduler(midi_out)
+
     osc_thread = threading.Thread(target=start_osc_server)
     osc_thread.daemon = True  # This ensures the thread will close when the program exits
     osc_thread.start()
@@ -44,6 +177,7 @@ def main():
         print("Shutting down synthesizer...")
     finally:
         # Clean up
+        note_offs.close()
         midi_out.close()
         pygame.midi.quit()
 
@@ -38,6 +38,33 @@ class AudioMixer:
 
 audio_mixer = AudioMixer()
 
+_one_shot_bank = None
+
+def get_one_shot_bank():
+    """Synthesize the drum, hat and click one-shots on first use and reuse them for every render."""
+    global _one_shot_bank
+    if _one_shot_bank is None:
+        t = np.linspace(0, 0.1, int(44100 * 0.1), False)
+        click_t = np.linspace(0, 0.05, int(44100 * 0.05), False)
+
+        # Create a clap sound and apply a low-pass filter to it
+        clap_env = np.exp(-np.linspace(0, 20, int(44100 * 0.05)))
+        clap_noise = np.random.normal(0, 0.1, int(44100 * 0.05))
+        b, a = signal.butter(4, 2000 / (44100 / 2), btype='lowpass')
+
+        _one_shot_bank = {
+            'click': np.sin(2 * np.pi * 1000 * click_t) * np.exp(-click_t * 20),
+            'accent': np.sin(2 * np.pi * 1500 * click_t) * np.exp(-click_t * 20),
+            'kick': np.sin(2 * np.pi * 60 * t) * np.exp(-t * 20),
+            'bass': np.sin(2 * np.pi * 50 * t) * np.exp(-t * 15),
+            'snare': np.random.normal(0, 0.1, int(44100 * 0.1)),
+            'clap': signal.lfilter(b, a, clap_noise * clap_env),
+            'closed_hat': np.random.normal(0, 0.1, int(44100 * 0.05)) * np.exp(-np.arange(int(44100 * 0.05)) / (44100 * 0.01)),
+            'open_hat': np.random.normal(0, 0.1, int(44100 * 0.1)) * np.exp(-np.arange(int(44100 * 0.1)) / (44100 * 0.05)),
+            'pedal_hat': np.random.normal(0, 0.1, int(44100 * 0.075)) * np.exp(-np.arange(int(44100 * 0.075)) / (44100 * 0.025)),
+        }
+    return _one_shot_bank
+
 class AudioPlaybackThread(QThread):
     update_display = pyqtSignal(str)
 
@@ -88,6 +115,8 @@ class Track(QWidget):
         self.initUI()
         self.playback_thread = None
         self.audio_thread = None
+        self.render_key = None
+        self.rendered_audio = None
         self.client = anthropic.Client(api_key="Your API Key Here")  # Replace with your actual API key
 
     def initUI(self):
@@ -161,8 +190,7 @@ class Track(QWidget):
         notation = self.text_input.toPlainText()
         tempo = self.parent().parent().tempo_spinbox.value()
     
-        audio_data = self.create_audio_data(notation, tempo)
-        audio_data *= self.gain  # Apply gain to the audio data
+        audio_data = self.render_audio(notation, tempo) * self.gain  # Apply gain to the audio data
         audio_mixer.add_track(self.name, audio_data)
         symbols = notation.replace('|', '').split()
         self.playback_thread = AudioPlaybackThread(self.name, symbols, tempo)
@@ -189,6 +217,14 @@ class Track(QWidget):
         # This method should be overridden by subclasses
         pass
 
+    def render_audio(self, notation, tempo):
+        # Only re-render when the notation, tempo or track type changed since the last play
+        render_key = (notation, tempo, type(self).__name__)
+        if render_key != self.render_key:
+            self.rendered_audio = self.create_audio_data(notation, tempo)
+            self.render_key = render_key
+        return self.rendered_audio
+
     def update_display(self, text):
         self.display_label.setText(text)
 
@@ -212,9 +248,9 @@ class MetronomeTrack(Track):
         symbols = notation.replace('|', '').split()
         full_sequence = np.zeros(int(44100 * beat_duration * len(symbols)))
         
-        t = np.linspace(0, 0.05, int(44100 * 0.05), False)
-        click = np.sin(2 * np.pi * 1000 * t) * np.exp(-t * 20)
-        accent = np.sin(2 * np.pi * 1500 * t) * np.exp(-t * 20)
+        bank = get_one_shot_bank()
+        click = bank['click']
+        accent = bank['accent']
         
         for i, symbol in enumerate(symbols):
             start = int(i * 44100 * beat_duration)
@@ -433,19 +469,11 @@ class DrumTrack(Track):
         symbols = notation.replace('|', '').split()
         full_sequence = np.zeros(int(44100 * beat_duration * len(symbols)))
         
-        t = np.linspace(0, 0.1, int(44100 * 0.1), False)
-        kick = np.sin(2 * np.pi * 60 * t) * np.exp(-t * 20)
-        bass = np.sin(2 * np.pi * 50 * t) * np.exp(-t * 15)
-        snare = np.random.normal(0, 0.1, int(44100 * 0.1))
-        
-        # Create a clap sound
-        clap_env = np.exp(-np.linspace(0, 20, int(44100 * 0.05)))
-        clap_noise = np.random.normal(0, 0.1, int(44100 * 0.05))
-        clap = clap_noise * clap_env
-        
-        # Apply a low-pass filter to the clap
-        b, a = signal.butter(4, 2000 / (44100 / 2), btype='lowpass')
-        clap = signal.lfilter(b, a, clap)
+        bank = get_one_shot_bank()
+        kick = bank['kick']
+        bass = bank['bass']
+        snare = bank['snare']
+        clap = bank['clap']
         
         for i, symbol in enumerate(symbols):
             start = int(i * 44100 * beat_duration)
@@ -567,9 +595,10 @@ class HatTrack(Track):
         symbols = notation.replace('|', '').split()
         full_sequence = np.zeros(int(44100 * beat_duration * len(symbols)))
         
-        closed_hat = np.random.normal(0, 0.1, int(44100 * 0.05)) * np.exp(-np.arange(int(44100 * 0.05)) / (44100 * 0.01))
-        open_hat = np.random.normal(0, 0.1, int(44100 * 0.1)) * np.exp(-np.arange(int(44100 * 0.1)) / (44100 * 0.05))
-        pedal_hat = np.random.normal(0, 0.1, int(44100 * 0.075)) * np.exp(-np.arange(int(44100 * 0.075)) / (44100 * 0.025))
+        bank = get_one_shot_bank()
+        closed_hat = bank['closed_hat']
+        open_hat = bank['open_hat']
+        pedal_hat = bank['pedal_hat']
         
         for i, symbol in enumerate(symbols):
             start = int(i * 44100 * beat_duration)
@@ -1011,8 +1040,7 @@ class MainWindow(QMainWindow):
         for track in self.tracks:
             notation = track.text_input.toPlainText()
             tempo = self.tempo_spinbox.value()
-            audio_data = track.create_audio_data(notation, tempo)
-            audio_data *= track.gain  # Apply gain to the audio data
+            audio_data = track.render_audio(notation, tempo) * track.gain  # Apply gain to the audio data
             audio_mixer.add_track(track.name, audio_data)
             symbols = notation.replace('|', '').split()
             track.playback_thread = AudioPlaybackThread(track.name, symbols, tempo)
@@ -1,6 +1,7 @@
 import pygame
 import numpy as np
 import sys
+import time
 import sounddevice as sd
 from scipy.signal import butter, lfilter
 
@@ -20,11 +21,9 @@ dx = space_length / grid_size_x  # Spatial resolution (m)
 dt = dx / (2 * c)         # Time step based on CFL condition
 time_steps = 100000       # Maximum number of time steps
 
-# Initialize Pressure Fields
-# Define as (grid_size_y, grid_size_x) to align with (height, width)
-p_previous = np.zeros((grid_size_y, grid_size_x))
-p_current = np.zeros((grid_size_y, grid_size_x))
-p_next = np.zeros((grid_size_y, grid_size_x))
+damping = 0.995           # Energy loss per time step
+substeps_per_frame = 1    # Time steps advanced per rendered frame
+phonon_interval = 1       # Time steps between phonon statistics samples
 
 # Source Parameters
 source_position = (grid_size_y // 2, grid_size_x // 2)  # (y, x)
@@ -32,6 +31,78 @@ source_frequency = 1000    # Frequency in Hz (1 kHz)
 source_angular_freq = 2 * pi * source_frequency
 source_amplitude = 1e-5     # Initial pressure amplitude (Pa)
 
+class WaveSolver:
+    """
+    2D wave equation FDTD core. The three pressure fields are preallocated and rotated
+    in place each step, and the update writes through out= arguments, so stepping
+    allocates nothing. Boundaries are never written and stay at zero.
+    """
+
+    def __init__(self, size_y, size_x, dx, dt, damping=damping):
+        # Define as (size_y, size_x) to align with (height, width)
+        self.p_previous = np.zeros((size_y, size_x))
+        self.p_current = np.zeros((size_y, size_x))
+        self.p_next = np.zeros((size_y, size_x))
+        self.scratch = np.zeros((size_y - 2, size_x - 2))
+        self.courant = (c ** 2) * (dt ** 2) / (dx ** 2)
+        self.dt = dt
+        self.damping = damping
+        self.t = 0
+
+    def step(self, source_position, amplitude):
+        p_previous, p_current, p_next = self.p_previous, self.p_current, self.p_next
+
+        # Update the source with the mapped amplitude
+        p_current[source_position] += amplitude * np.sin(source_angular_freq * self.t * self.dt)
+
+        # Compute the next pressure field on the interior points, in the same operation
+        # order as 2 * p - p_prev + courant * laplacian
+        center = p_current[1:-1, 1:-1]
+        interior = p_next[1:-1, 1:-1]
+        np.add(p_current[2:, 1:-1], p_current[:-2, 1:-1], out=interior)
+        interior += p_current[1:-1, 2:]
+        interior += p_current[1:-1, :-2]
+        np.multiply(center, 4, out=self.scratch)
+        interior -= self.scratch
+        interior *= self.courant
+        np.multiply(center, 2, out=self.scratch)
+        self.scratch -= p_previous[1:-1, 1:-1]
+        interior += self.scratch
+
+        # Apply damping to simulate energy loss
+        interior *= self.damping
+
+        # The oldest field becomes the next step's output buffer
+        self.p_previous, self.p_current, self.p_next = p_current, p_next, p_previous
+        self.t += 1
+
+    def run(self, steps, source_position, amplitude):
+        for _ in range(steps):
+            self.step(source_position, amplitude)
+
+def benchmark_solver(grid_sizes=(200, 512, 1024), duration=2.0):
+    """Report solver steps per second for square grids of each size."""
+    results = {}
+    for size in grid_sizes:
+        grid_dx = space_length / size
+        solver = WaveSolver(size, size, grid_dx, grid_dx / (2 * c))
+        position = (size // 2, size // 2)
+        solver.run(5, position, source_amplitude)  # Warm up
+        steps = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            solver.run(10, position, source_amplitude)
+            steps += 10
+        results[size] = steps / (time.perf_counter() - start)
+        print(f"{size}x{size}: {results[size]:.1f} steps/s")
+    return results
+
+if __name__ == "__main__" and "--benchmark" in sys.argv[1:]:
+    benchmark_solver()
+    sys.exit()
+
+solver = WaveSolver(grid_size_y, grid_size_x, dx, dt)
+
 # Initialize Pygame
 # Initialize Pygame
 pygame.init()
@@ -182,33 +253,17 @@ while running and t < time_steps:
     # Map current dBA to source amplitude
     source_amplitude = dBA_to_amplitude(current_dBA)
 
-    # Update the source with the mapped amplitude
-    p_current[source_position] += source_amplitude * np.sin(source_angular_freq * t * dt)
-
-    # Compute the next pressure field using the 2D wave equation (FDTD)
-    # Update interior points
-    p_next[1:-1, 1:-1] = (
-        2 * p_current[1:-1, 1:-1] - p_previous[1:-1, 1:-1] +
-        (c ** 2) * (dt ** 2) / (dx ** 2) * (
-            p_current[2:, 1:-1] + p_current[:-2, 1:-1] +
-            p_current[1:-1, 2:] + p_current[1:-1, :-2] -
-            4 * p_current[1:-1, 1:-1]
-        )
-    )
-
-    # Apply damping to simulate energy loss
-    damping = 0.995
-    p_next *= damping
+    # Advance the field by several time steps per rendered frame
+    solver.run(substeps_per_frame, source_position, source_amplitude)
+    t = solver.t
 
-    # Update previous and current pressure fields
-    p_previous, p_current = p_current, p_next.copy()
-
-    # Calculate phonon counts
-    phonons = calculate_phonons(p_current)
-    phonon_at_source.append(phonons[source_position])
+    # Calculate phonon counts on a decimated schedule
+    if t // phonon_interval > (t - substeps_per_frame) // phonon_interval:
+        phonons = calculate_phonons(solver.p_current)
+        phonon_at_source.append(phonons[source_position])
 
     # Draw the pressure field
-    draw_pressure_field(p_current)
+    draw_pressure_field(solver.p_current)
 
     # Update the display
     pygame.display.flip()
@@ -216,9 +271,6 @@ while running and t < time_steps:
     # Control the simulation speed
     clock.tick(60)  # Limit to 60 FPS
 
-    # Increment time step
-    t += 1
-
 # After simulation, save phonon counts to a file
 with open("phonon_counts.txt", "w") as file:
     for count in phonon_at_source: